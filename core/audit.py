@@ -0,0 +1,37 @@
+from .models import AuditLog
+
+
+class AuditBatch:
+    """
+    Buffer audit rows and write them with one bulk_create on exit.
+
+    Usage:
+        with AuditBatch() as audit:
+            audit.log(user=request.user, action=AuditLog.Action.CREATE, ...)
+
+    Rows are discarded if the block raises, so they follow the fate of the
+    surrounding transaction.
+    """
+    model = AuditLog
+    batch_size = 500
+
+    def __init__(self):
+        self.rows = []
+
+    def log(self, **kwargs):
+        self.rows.append(self.model(**kwargs))
+
+    def flush(self):
+        if self.rows:
+            self.model.objects.bulk_create(self.rows, batch_size=self.batch_size)
+            self.rows = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.flush()
+        else:
+            self.rows = []
+        return False
@@ -0,0 +1,17 @@
+from .permissions import effective_permissions
+
+
+def user_permissions(request):
+    """
+    Template context processor exposing the user's permission codenames.
+    Covers unscoped, unconditioned grants only; see core.permissions.effective_permissions.
+    """
+    if request.user.is_authenticated:
+        permissions = effective_permissions(request.user.id)
+    else:
+        permissions = frozenset()
+    return {
+        'user_permissions': permissions,
+        # Bound frozenset method: no extra Python frame per template check
+        'has_permission': permissions.__contains__,
+    }
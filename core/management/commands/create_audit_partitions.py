@@ -0,0 +1,81 @@
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DatabaseError, connection, transaction
+from django.utils import timezone
+
+
+AUDIT_TABLES = ['core_permissionaudit', 'core_auditlog']
+
+
+def add_months(day, months):
+    """Return the first day of the month `months` after `day`"""
+    month_index = day.month - 1 + months
+    return date(day.year + month_index // 12, month_index % 12 + 1, 1)
+
+
+class Command(BaseCommand):
+    help = 'Create upcoming monthly PostgreSQL partitions for the audit tables (run from cron)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--months', type=int, default=3, help='Number of months ahead to create')
+
+    def handle(self, *args, **options):
+        if connection.vendor != 'postgresql':
+            self.stdout.write('Audit tables are only partitioned on PostgreSQL; nothing to do.')
+            return
+
+        today = timezone.localdate()
+        current_month = date(today.year, today.month, 1)
+
+        failed = []
+        for table in AUDIT_TABLES:
+            for offset in range(options['months'] + 1):
+                start = add_months(current_month, offset)
+                end = add_months(current_month, offset + 1)
+                partition = f'{table}_{start:%Y_%m}'
+                try:
+                    with transaction.atomic():
+                        self.ensure_partition(table, partition, start, end)
+                except DatabaseError as e:
+                    failed.append(partition)
+                    self.stderr.write(self.style.ERROR(f'Could not create partition {partition}: {e}'))
+
+        if failed:
+            raise CommandError(f"Failed to create audit partitions: {', '.join(failed)}")
+        self.stdout.write(self.style.SUCCESS('Audit partitions are up to date'))
+
+    def ensure_partition(self, table, partition, start, end):
+        """
+        Create the monthly partition for [start, end). Rows that already landed
+        in the DEFAULT partition for that range would block a plain CREATE, so
+        the DEFAULT partition is detached, the new partition created, the rows
+        moved across and the DEFAULT partition reattached, all in one transaction.
+        """
+        default = f'{table}_default'
+        bounds = f"FOR VALUES FROM ('{start.isoformat()}') TO ('{end.isoformat()}')"
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT to_regclass(%s) IS NOT NULL', [partition])
+            if cursor.fetchone()[0]:
+                self.stdout.write(f'Partition {partition} already exists')
+                return
+
+            cursor.execute(
+                f'SELECT EXISTS (SELECT 1 FROM {default} WHERE "timestamp" >= %s AND "timestamp" < %s)',
+                [start, end],
+            )
+            if not cursor.fetchone()[0]:
+                cursor.execute(f'CREATE TABLE {partition} PARTITION OF {table} {bounds}')
+                self.stdout.write(f'Created partition {partition}')
+                return
+
+            cursor.execute(f'ALTER TABLE {table} DETACH PARTITION {default}')
+            cursor.execute(f'CREATE TABLE {partition} PARTITION OF {table} {bounds}')
+            cursor.execute(
+                f'WITH moved AS (DELETE FROM {default} WHERE "timestamp" >= %s AND "timestamp" < %s RETURNING *) '
+                f'INSERT INTO {partition} SELECT * FROM moved',
+                [start, end],
+            )
+            moved = cursor.rowcount
+            cursor.execute(f'ALTER TABLE {table} ATTACH PARTITION {default} DEFAULT')
+            self.stdout.write(f'Created partition {partition} and moved {moved} rows out of {default}')
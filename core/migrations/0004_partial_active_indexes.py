@@ -0,0 +1,31 @@
+# Generated by Django 5.2.18 on 2026-10-15 22:31
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0002_permission_permissionaudit_permissiongroup_and_more'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='permissionoverride',
+            name='core_permis_user_id_5850d6_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='userrole',
+            name='core_userro_user_id_e14492_idx',
+        ),
+        migrations.AddIndex(
+            model_name='permissionoverride',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['user', 'start_date'], name='permoverride_active_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='userrole',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['user', 'start_date'], name='userrole_active_idx'),
+        ),
+    ]
@@ -0,0 +1,55 @@
+# Generated by Django 5.2.18 on 2026-10-15 22:31
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def backfill_condition_flags(apps, schema_editor):
+    RolePermission = apps.get_model('core', 'RolePermission')
+    RolePermissionCondition = apps.get_model('core', 'RolePermissionCondition')
+    UserRole = apps.get_model('core', 'UserRole')
+
+    conditioned = [rp for rp in RolePermission.objects.only('id', 'conditions') if rp.conditions]
+    RolePermission.objects.filter(id__in=[rp.id for rp in conditioned]).update(has_conditions=True)
+    RolePermissionCondition.objects.bulk_create([
+        RolePermissionCondition(role_permission_id=rp.id, key=key, value=value)
+        for rp in conditioned
+        for key, value in rp.conditions.items()
+    ])
+
+    UserRole.objects.filter(
+        id__in=[ur.id for ur in UserRole.objects.only('id', 'conditions') if ur.conditions]
+    ).update(has_conditions=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0004_partial_active_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='rolepermission',
+            name='has_conditions',
+            field=models.BooleanField(db_index=True, default=False),
+        ),
+        migrations.AddField(
+            model_name='userrole',
+            name='has_conditions',
+            field=models.BooleanField(db_index=True, default=False),
+        ),
+        migrations.CreateModel(
+            name='RolePermissionCondition',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('key', models.CharField(max_length=100)),
+                ('value', models.JSONField(blank=True, null=True)),
+                ('role_permission', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='condition_rows', to='core.rolepermission')),
+            ],
+            options={
+                'unique_together': {('role_permission', 'key')},
+            },
+        ),
+        migrations.RunPython(backfill_condition_flags, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,96 @@
+# Generated by Django 5.2.18 on 2026-10-15 22:48
+
+from django.db import migrations, models
+
+
+PERMISSION_AUDIT_ACTIONS = {
+    'granted': 1,
+    'revoked': 2,
+    'modified': 3,
+    'override_granted': 4,
+    'override_revoked': 5,
+    'role_assigned': 6,
+    'role_removed': 7,
+}
+
+AUDIT_LOG_ACTIONS = {
+    'create': 1,
+    'update': 2,
+    'delete': 3,
+    'login': 4,
+    'logout': 5,
+    'approve': 6,
+    'reject': 7,
+    'submit': 8,
+}
+
+
+def encode_actions(apps, schema_editor):
+    for model_name, mapping in (('PermissionAudit', PERMISSION_AUDIT_ACTIONS), ('AuditLog', AUDIT_LOG_ACTIONS)):
+        model = apps.get_model('core', model_name)
+        for name, code in mapping.items():
+            model.objects.filter(action=name).update(action_code=code)
+
+
+def decode_actions(apps, schema_editor):
+    for model_name, mapping in (('PermissionAudit', PERMISSION_AUDIT_ACTIONS), ('AuditLog', AUDIT_LOG_ACTIONS)):
+        model = apps.get_model('core', model_name)
+        for name, code in mapping.items():
+            model.objects.filter(action_code=code).update(action=name)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0005_conditions_flags'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='permissionaudit',
+            name='core_permis_action_eb6c88_idx',
+        ),
+        migrations.AddField(
+            model_name='permissionaudit',
+            name='action_code',
+            field=models.PositiveSmallIntegerField(default=1),
+        ),
+        migrations.AddField(
+            model_name='auditlog',
+            name='action_code',
+            field=models.PositiveSmallIntegerField(default=1),
+        ),
+        migrations.RunPython(encode_actions, decode_actions),
+        migrations.RemoveField(
+            model_name='permissionaudit',
+            name='action',
+        ),
+        migrations.RemoveField(
+            model_name='auditlog',
+            name='action',
+        ),
+        migrations.RenameField(
+            model_name='permissionaudit',
+            old_name='action_code',
+            new_name='action',
+        ),
+        migrations.RenameField(
+            model_name='auditlog',
+            old_name='action_code',
+            new_name='action',
+        ),
+        migrations.AlterField(
+            model_name='permissionaudit',
+            name='action',
+            field=models.PositiveSmallIntegerField(choices=[(1, 'Permission Granted'), (2, 'Permission Revoked'), (3, 'Permission Modified'), (4, 'Override Granted'), (5, 'Override Revoked'), (6, 'Role Assigned'), (7, 'Role Removed')], default=1),
+        ),
+        migrations.AlterField(
+            model_name='auditlog',
+            name='action',
+            field=models.PositiveSmallIntegerField(choices=[(1, 'Create'), (2, 'Update'), (3, 'Delete'), (4, 'Login'), (5, 'Logout'), (6, 'Approve'), (7, 'Reject'), (8, 'Submit')], default=1),
+        ),
+        migrations.AddIndex(
+            model_name='permissionaudit',
+            index=models.Index(fields=['action', 'timestamp'], name='core_permis_action_eb6c88_idx'),
+        ),
+    ]
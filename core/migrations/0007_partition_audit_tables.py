@@ -0,0 +1,88 @@
+# Generated by Django 5.2.18 on 2026-10-15 23:02
+
+from datetime import date
+
+from django.db import migrations
+from django.utils import timezone
+
+
+AUDIT_TABLES = ['core_permissionaudit', 'core_auditlog']
+
+# Months past the current one that get a partition up front; create_audit_partitions keeps extending this
+MONTHS_AHEAD = 3
+
+
+def add_months(day, months):
+    """Return the first day of the month `months` after `day`"""
+    month_index = day.month - 1 + months
+    return date(day.year + month_index // 12, month_index % 12 + 1, 1)
+
+
+def partition_audit_tables(apps, schema_editor):
+    """Rebuild the audit tables as PostgreSQL tables range-partitioned by timestamp"""
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+
+    with schema_editor.connection.cursor() as cursor:
+        for table in AUDIT_TABLES:
+            old_table = f'{table}_unpartitioned'
+
+            # Remember foreign keys and secondary indexes before the rename
+            cursor.execute(
+                "SELECT conname, pg_get_constraintdef(oid) FROM pg_constraint "
+                "WHERE conrelid = %s::regclass AND contype = 'f'",
+                [table],
+            )
+            foreign_keys = cursor.fetchall()
+            cursor.execute(
+                "SELECT indexname, indexdef FROM pg_indexes "
+                "WHERE tablename = %s AND indexname NOT LIKE %s",
+                [table, '%_pkey'],
+            )
+            indexes = cursor.fetchall()
+
+            cursor.execute(f'ALTER TABLE {table} RENAME TO {old_table}')
+            cursor.execute(
+                f'CREATE TABLE {table} (LIKE {old_table} INCLUDING DEFAULTS INCLUDING IDENTITY '
+                f'INCLUDING CONSTRAINTS) PARTITION BY RANGE ("timestamp")'
+            )
+            # The partition key has to be part of the primary key
+            cursor.execute(f'ALTER TABLE {table} ADD PRIMARY KEY (id, "timestamp")')
+            cursor.execute(f'CREATE TABLE {table}_default PARTITION OF {table} DEFAULT')
+
+            # Monthly partitions for every month that already holds rows, plus the next few, are created
+            # before the copy: PostgreSQL refuses to add a partition for a range the DEFAULT partition has rows in
+            cursor.execute(f'SELECT MIN("timestamp") FROM {old_table}')
+            oldest = cursor.fetchone()[0]
+            current_month = add_months(timezone.now().date(), 0)
+            month = add_months(min(oldest.date(), current_month) if oldest else current_month, 0)
+            while month <= add_months(current_month, MONTHS_AHEAD):
+                cursor.execute(
+                    f"CREATE TABLE {table}_{month:%Y_%m} PARTITION OF {table} "
+                    f"FOR VALUES FROM ('{month.isoformat()}') TO ('{add_months(month, 1).isoformat()}')"
+                )
+                month = add_months(month, 1)
+
+            cursor.execute(f'INSERT INTO {table} SELECT * FROM {old_table}')
+            cursor.execute(
+                f"SELECT setval(pg_get_serial_sequence('{table}', 'id'), "
+                f"COALESCE((SELECT MAX(id) FROM {table}), 0) + 1, false)"
+            )
+            cursor.execute(f'DROP TABLE {old_table}')
+
+            for name, definition in foreign_keys:
+                cursor.execute(f'ALTER TABLE {table} ADD CONSTRAINT {name} {definition}')
+            # Definitions were read before the rename, so they already name the new parent table
+            for name, definition in indexes:
+                cursor.execute(definition)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0006_audit_action_codes'),
+    ]
+
+    operations = [
+        migrations.RunPython(partition_audit_tables, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,38 @@
+# Generated by Django 5.2.18 on 2026-10-15 23:10
+
+from django.db import migrations
+
+
+BRIN_INDEXES = [
+    ('permaudit_ts_brin', 'core_permissionaudit'),
+    ('auditlog_ts_brin', 'core_auditlog'),
+]
+
+
+def create_brin_indexes(apps, schema_editor):
+    """Insert-ordered audit timestamps suit a tiny BRIN index for range scans"""
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for name, table in BRIN_INDEXES:
+        schema_editor.execute(
+            f'CREATE INDEX IF NOT EXISTS {name} ON {table} USING brin ("timestamp") '
+            f'WITH (pages_per_range = 32)'
+        )
+
+
+def drop_brin_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for name, _ in BRIN_INDEXES:
+        schema_editor.execute(f'DROP INDEX IF EXISTS {name}')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0007_partition_audit_tables'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_brin_indexes, drop_brin_indexes),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 5.2.18 on 2026-10-15 22:35
+
+from django.db import migrations, models
+
+
+def backfill_role_codenames(apps, schema_editor):
+    Role = apps.get_model('core', 'Role')
+    UserRole = apps.get_model('core', 'UserRole')
+    UserRole.objects.update(
+        role_codename=models.Subquery(Role.objects.filter(pk=models.OuterRef('role_id')).values('codename')[:1])
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0008_audit_timestamp_brin'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='userrole',
+            name='role_codename',
+            field=models.CharField(db_index=True, default='', max_length=100),
+        ),
+        migrations.RunPython(backfill_role_codenames, migrations.RunPython.noop),
+    ]
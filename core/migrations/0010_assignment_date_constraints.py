@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-15 22:35
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0009_userrole_role_codename'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddConstraint(
+            model_name='permissionoverride',
+            constraint=models.CheckConstraint(condition=models.Q(('end_date__isnull', True), ('end_date__gte', models.F('start_date')), _connector='OR'), name='permoverride_dates_valid'),
+        ),
+        migrations.AddConstraint(
+            model_name='userrole',
+            constraint=models.CheckConstraint(condition=models.Q(('end_date__isnull', True), ('end_date__gte', models.F('start_date')), _connector='OR'), name='userrole_dates_valid'),
+        ),
+    ]
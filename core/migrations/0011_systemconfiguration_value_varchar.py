@@ -0,0 +1,38 @@
+# Generated by Django 5.2.18 on 2026-10-15 22:37
+
+from django.db import migrations, models
+from django.db.models.functions import Length
+
+
+MAX_VALUE_LENGTH = 4096
+
+
+def check_value_lengths(apps, schema_editor):
+    # Refuse to shorten the column over existing values rather than let the ALTER fail or truncate
+    SystemConfiguration = apps.get_model('core', 'SystemConfiguration')
+    too_long = list(
+        SystemConfiguration.objects.annotate(value_length=Length('value'))
+        .filter(value_length__gt=MAX_VALUE_LENGTH)
+        .values_list('key', flat=True)
+    )
+    if too_long:
+        raise ValueError(
+            f"System configuration values longer than {MAX_VALUE_LENGTH} characters must be "
+            f"shortened before migrating: {', '.join(too_long)}"
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0010_assignment_date_constraints'),
+    ]
+
+    operations = [
+        migrations.RunPython(check_value_lengths, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='systemconfiguration',
+            name='value',
+            field=models.CharField(default='', max_length=4096),
+        ),
+    ]
@@ -0,0 +1,42 @@
+# Generated by Django 5.2.18 on 2026-10-15 23:44
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+def check_duplicate_active_assignments(apps, schema_editor):
+    # unique_together let department-less assignments repeat (NULLs are distinct); report them
+    # rather than let the constraint fail or pick which duplicate to deactivate
+    UserRole = apps.get_model('core', 'UserRole')
+    duplicates = list(
+        UserRole.objects.filter(is_active=True)
+        .values('user_id', 'role_id', 'department_id')
+        .annotate(assignments=models.Count('id'))
+        .filter(assignments__gt=1)
+        .values_list('user_id', 'role_id', 'department_id')
+    )
+    if duplicates:
+        raise ValueError(
+            "Deactivate duplicate active role assignments (user_id, role_id, department_id) "
+            f"before migrating: {', '.join(map(str, duplicates))}"
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0011_systemconfiguration_value_varchar'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RunPython(check_duplicate_active_assignments, migrations.RunPython.noop),
+        migrations.AlterUniqueTogether(
+            name='userrole',
+            unique_together=set(),
+        ),
+        migrations.AddConstraint(
+            model_name='userrole',
+            constraint=models.UniqueConstraint(condition=models.Q(('is_active', True)), fields=('user', 'role', 'department'), name='uniq_active_userrole', nulls_distinct=False),
+        ),
+    ]
@@ -1,7 +1,21 @@
-from django.db import models
+import copy
+
+from django.db import models, transaction
 from django.contrib.auth.models import User
 from django.core.cache import cache
 from django.utils import timezone
+from django.utils.functional import cached_property
+
+
+# Sentinel distinguishing a cache miss from a cached falsy value
+_MISSING = object()
+
+# Cached marker for configuration keys that do not exist in the database
+_CONFIG_TOMBSTONE = "__none__"
+
+# Cache key for the active configuration listing; kept outside the config_{key} namespace
+# used by get_value so a configuration row keyed "all" cannot collide with it
+CONFIG_LIST_CACHE_KEY = "sysconfig:all:v1"
 
 
 class Department(models.Model):
@@ -231,15 +245,24 @@ class Role(models.Model):
         return target_role in self.can_evaluate_roles.all()
 
 
+class RolePermissionQuerySet(models.QuerySet):
+    def with_related(self):
+        """Join the rows rendered by __str__ and list views"""
+        return self.select_related('role', 'permission')
+
+
 class RolePermission(models.Model):
     """Many-to-many relationship between roles and permissions with conditions"""
     role = models.ForeignKey(Role, on_delete=models.CASCADE, related_name='role_permissions')
     permission = models.ForeignKey(Permission, on_delete=models.CASCADE, related_name='role_permissions')
     conditions = models.JSONField(default=dict, blank=True)
+    has_conditions = models.BooleanField(default=False, db_index=True)
     is_active = models.BooleanField(default=True)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = RolePermissionQuerySet.as_manager()
+
     class Meta:
         unique_together = ['role', 'permission']
         indexes = [
@@ -250,11 +273,113 @@ class RolePermission(models.Model):
     def __str__(self):
         return f"{self.role.name} - {self.permission.name}"
 
+    @cached_property
+    def parsed_conditions(self):
+        """Conditions dict, read once per instance; empty when there are none"""
+        if not self.conditions:
+            return {}
+        return self.conditions
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Snapshot the stored conditions so save() only resyncs condition rows when they change
+        if 'conditions' in instance.__dict__:
+            instance._stored_conditions = copy.deepcopy(instance.conditions)
+        return instance
+
+    def save(self, *args, **kwargs):
+        self.__dict__.pop('parsed_conditions', None)
+        update_fields = kwargs.get('update_fields')
+        if update_fields is None:
+            # Django saves only the loaded fields of an instance with deferred fields
+            conditions_written = 'conditions' not in self.get_deferred_fields()
+        else:
+            conditions_written = 'conditions' in update_fields
+        if not conditions_written:
+            super().save(*args, **kwargs)
+            return
+        
+        self.has_conditions = bool(self.conditions)
+        if update_fields is not None:
+            kwargs['update_fields'] = {*update_fields, 'has_conditions'}
+        # New rows have no condition rows yet
+        stored_conditions = {} if self._state.adding else getattr(self, '_stored_conditions', _MISSING)
+        super().save(*args, **kwargs)
+        if self.conditions != stored_conditions:
+            self.sync_condition_rows()
+        self._stored_conditions = copy.deepcopy(self.conditions)
+
+    def sync_condition_rows(self):
+        """Mirror the conditions dict into RolePermissionCondition rows"""
+        self.condition_rows.all().delete()
+        if self.has_conditions:
+            RolePermissionCondition.objects.bulk_create([
+                RolePermissionCondition(role_permission=self, key=key, value=value)
+                for key, value in self.parsed_conditions.items()
+            ])
+
+
+class RolePermissionCondition(models.Model):
+    """Normalized, indexable copy of a single RolePermission condition"""
+    role_permission = models.ForeignKey(RolePermission, on_delete=models.CASCADE, related_name='condition_rows')
+    key = models.CharField(max_length=100)
+    value = models.JSONField(null=True, blank=True)
+
+    class Meta:
+        unique_together = ['role_permission', 'key']
+
+    def __str__(self):
+        return f"{self.role_permission_id}: {self.key}"
+
+
+def current_assignment_q(now, prefix=''):
+    """
+    Q matching assignments active at ``now``. ``prefix`` reaches them through a
+    relation, e.g. 'role__user_roles__'; use it inside a single filter() call so
+    every condition applies to the same joined row.
+    """
+    return (
+        models.Q(**{f'{prefix}is_active': True, f'{prefix}start_date__lte': now}) &
+        (models.Q(**{f'{prefix}end_date__isnull': True}) | models.Q(**{f'{prefix}end_date__gte': now}))
+    )
+
+
+class TemporalAssignmentQuerySet(models.QuerySet):
+    """QuerySet for assignments bounded by is_active/start_date/end_date"""
+
+    def current(self, now=None):
+        """
+        Assignments active at ``now`` (default: right now), filtered in SQL rather
+        than via is_current. Pass ``now`` to share one timestamp across queries.
+        """
+        return self.filter(current_assignment_q(now or timezone.now()))
+
+    def annotate_is_current(self, now=None):
+        """Annotate is_current_db, the SQL equivalent of the is_current property"""
+        return self.annotate(is_current_db=models.ExpressionWrapper(
+            current_assignment_q(now or timezone.now()),
+            output_field=models.BooleanField(),
+        ))
+
+
+class UserRoleQuerySet(TemporalAssignmentQuerySet):
+    def with_related(self):
+        """Join the rows rendered by __str__ and list views"""
+        return self.select_related('user', 'role', 'department')
+
+
+class PermissionOverrideQuerySet(TemporalAssignmentQuerySet):
+    def with_related(self):
+        """Join the rows rendered by __str__ and list views"""
+        return self.select_related('user', 'permission', 'granted_by')
+
 
 class UserRole(models.Model):
     """User-role assignments with temporal and conditional constraints"""
     user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='core_user_roles')
     role = models.ForeignKey(Role, on_delete=models.CASCADE, related_name='user_roles')
+    role_codename = models.CharField(max_length=100, db_index=True, default="")  # Denormalized from role.codename
     department = models.ForeignKey(Department, on_delete=models.SET_NULL, null=True, blank=True, related_name='core_user_roles')
     
     # Temporal constraints
@@ -263,6 +388,7 @@ class UserRole(models.Model):
     
     # Conditional constraints
     conditions = models.JSONField(default=dict, blank=True)
+    has_conditions = models.BooleanField(default=False, db_index=True)
     
     # Assignment metadata
     assigned_by = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True, related_name='role_assignments')
@@ -271,20 +397,58 @@ class UserRole(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = UserRoleQuerySet.as_manager()
+
     class Meta:
-        unique_together = ['user', 'role', 'department']
         indexes = [
-            models.Index(fields=['user', 'is_active', 'start_date']),
+            models.Index(fields=['user', 'start_date'], condition=models.Q(is_active=True), name='userrole_active_idx'),
             models.Index(fields=['role', 'is_active']),
             models.Index(fields=['department', 'is_active']),
         ]
+        constraints = [
+            models.CheckConstraint(
+                condition=models.Q(end_date__isnull=True) | models.Q(end_date__gte=models.F('start_date')),
+                name='userrole_dates_valid',
+            ),
+            # One active assignment per (user, role, department); a missing department counts as a value
+            models.UniqueConstraint(
+                fields=['user', 'role', 'department'],
+                condition=models.Q(is_active=True),
+                nulls_distinct=False,
+                name='uniq_active_userrole',
+            ),
+        ]
 
     def __str__(self):
         return f"{self.user.username} - {self.role.name}"
 
+    @cached_property
+    def parsed_conditions(self):
+        """Conditions dict, read once per instance; empty when there are none"""
+        if not self.conditions:
+            return {}
+        return self.conditions
+
+    def save(self, *args, **kwargs):
+        self.__dict__.pop('parsed_conditions', None)
+        update_fields = kwargs.get('update_fields')
+        extra_fields = set()
+        if update_fields is None or 'conditions' in update_fields:
+            self.has_conditions = bool(self.conditions)
+            extra_fields.add('has_conditions')
+        if update_fields is None or 'role' in update_fields:
+            self.role_codename = self.role.codename
+            extra_fields.add('role_codename')
+        if update_fields is not None:
+            kwargs['update_fields'] = {*update_fields, *extra_fields}
+        super().save(*args, **kwargs)
+
     @property
     def is_current(self):
-        """Check if the role assignment is currently active"""
+        """
+        Check if the role assignment is currently active.
+        For querysets use .current() / .annotate_is_current() so the check runs in SQL.
+        """
         now = timezone.now()
         return (
             self.is_active and
@@ -316,19 +480,30 @@ class PermissionOverride(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = PermissionOverrideQuerySet.as_manager()
+
     class Meta:
         unique_together = ['user', 'permission', 'override_type']
         indexes = [
-            models.Index(fields=['user', 'is_active', 'start_date']),
+            models.Index(fields=['user', 'start_date'], condition=models.Q(is_active=True), name='permoverride_active_idx'),
             models.Index(fields=['permission', 'is_active']),
         ]
+        constraints = [
+            models.CheckConstraint(
+                condition=models.Q(end_date__isnull=True) | models.Q(end_date__gte=models.F('start_date')),
+                name='permoverride_dates_valid',
+            ),
+        ]
 
     def __str__(self):
         return f"{self.user.username} - {self.permission.name} ({self.override_type})"
 
     @property
     def is_current(self):
-        """Check if the override is currently active"""
+        """
+        Check if the override is currently active.
+        For querysets use .current() / .annotate_is_current() so the check runs in SQL.
+        """
         now = timezone.now()
         return (
             self.is_active and
@@ -337,28 +512,37 @@ class PermissionOverride(models.Model):
         )
 
 
+class PermissionAuditQuerySet(models.QuerySet):
+    def with_related(self):
+        """Join the rows rendered by __str__ and list views"""
+        return self.select_related('user', 'permission', 'performed_by', 'role')
+
+
 class PermissionAudit(models.Model):
     """Audit trail for all permission changes"""
-    ACTION_CHOICES = [
-        ('granted', 'Permission Granted'),
-        ('revoked', 'Permission Revoked'),
-        ('modified', 'Permission Modified'),
-        ('override_granted', 'Override Granted'),
-        ('override_revoked', 'Override Revoked'),
-        ('role_assigned', 'Role Assigned'),
-        ('role_removed', 'Role Removed'),
-    ]
+    class Action(models.IntegerChoices):
+        GRANTED = 1, 'Permission Granted'
+        REVOKED = 2, 'Permission Revoked'
+        MODIFIED = 3, 'Permission Modified'
+        OVERRIDE_GRANTED = 4, 'Override Granted'
+        OVERRIDE_REVOKED = 5, 'Override Revoked'
+        ROLE_ASSIGNED = 6, 'Role Assigned'
+        ROLE_REMOVED = 7, 'Role Removed'
+
+    ACTION_CHOICES = Action.choices
 
     user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='permission_audits')
     permission = models.ForeignKey(Permission, on_delete=models.CASCADE, related_name='permission_audits')
-    action = models.CharField(max_length=20, choices=ACTION_CHOICES, default='granted')
+    action = models.PositiveSmallIntegerField(choices=Action.choices, default=Action.GRANTED)
     role = models.ForeignKey(Role, on_delete=models.SET_NULL, null=True, blank=True)
     override = models.ForeignKey(PermissionOverride, on_delete=models.SET_NULL, null=True, blank=True)
     reason = models.TextField(blank=True)
     performed_by = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True, related_name='permission_actions')
-    ip_address = models.GenericIPAddressField(null=True, blank=True)
+    ip_address = models.GenericIPAddressField(null=True, blank=True)  # native inet column on PostgreSQL
     user_agent = models.TextField(blank=True)
-    timestamp = models.DateTimeField(auto_now_add=True)
+    timestamp = models.DateTimeField(auto_now_add=True)  # only time column; audit rows carry no created_at/updated_at
+
+    objects = PermissionAuditQuerySet.as_manager()
 
     class Meta:
         ordering = ['-timestamp']
@@ -370,7 +554,7 @@ class PermissionAudit(models.Model):
         ]
 
     def __str__(self):
-        return f"{self.action} {self.permission.name} for {self.user.username} at {self.timestamp}"
+        return f"{self.get_action_display()} {self.permission.name} for {self.user.username} at {self.timestamp}"
 
 
 class PermissionGroup(models.Model):
@@ -397,7 +581,7 @@ class PermissionGroup(models.Model):
 class SystemConfiguration(models.Model):
     """System-wide configuration settings"""
     key = models.CharField(max_length=100, unique=True, default="")
-    value = models.TextField(default="")
+    value = models.CharField(max_length=4096, default="")
     description = models.TextField(blank=True)
     is_active = models.BooleanField(default=True)
     created_at = models.DateTimeField(auto_now_add=True)
@@ -413,30 +597,42 @@ class SystemConfiguration(models.Model):
     def get_value(cls, key, default=None):
         """Get configuration value with caching"""
         cache_key = f"config_{key}"
-        value = cache.get(cache_key)
-        if value is None:
+        value = cache.get(cache_key, _MISSING)
+        if value is _MISSING:
             try:
-                config = cls.objects.get(key=key, is_active=True)
+                config = cls.objects.only('value').get(key=key, is_active=True)
                 value = config.value
                 cache.set(cache_key, value, 3600)  # Cache for 1 hour
             except cls.DoesNotExist:
-                value = default
+                # Cache the miss briefly so repeated lookups skip the database
+                cache.set(cache_key, _CONFIG_TOMBSTONE, 60)
+                return default
+        if value == _CONFIG_TOMBSTONE:
+            return default
         return value
 
+    @classmethod
+    def get_active_list(cls):
+        """Get every active configuration as dicts, cached for 5 minutes"""
+        return cache.get_or_set(
+            CONFIG_LIST_CACHE_KEY,
+            lambda: list(cls.objects.filter(is_active=True).values(
+                'key', 'value', 'description', 'created_at', 'updated_at'
+            )),
+            300,
+        )
+
     @classmethod
     def set_value(cls, key, value, description=""):
         """Set configuration value"""
-        config, created = cls.objects.get_or_create(
-            key=key,
-            defaults={'value': value, 'description': description}
-        )
-        if not created:
-            config.value = value
-            config.description = description
-            config.save()
-        
-        # Clear cache
-        cache.delete(f"config_{key}")
+        with transaction.atomic():
+            config, _ = cls.objects.update_or_create(
+                key=key,
+                defaults={'value': value, 'description': description, 'is_active': True}
+            )
+
+        # Clear cache (including any cached miss for this key) after the write
+        cache.delete_many([f"config_{key}", CONFIG_LIST_CACHE_KEY])
         return config
 
 
@@ -489,29 +685,30 @@ class ApprovalWorkflowLevel(models.Model):
 
 class AuditLog(models.Model):
     """Audit trail for all system changes"""
-    ACTION_CHOICES = [
-        ('create', 'Create'),
-        ('update', 'Update'),
-        ('delete', 'Delete'),
-        ('login', 'Login'),
-        ('logout', 'Logout'),
-        ('approve', 'Approve'),
-        ('reject', 'Reject'),
-        ('submit', 'Submit'),
-    ]
+    class Action(models.IntegerChoices):
+        CREATE = 1, 'Create'
+        UPDATE = 2, 'Update'
+        DELETE = 3, 'Delete'
+        LOGIN = 4, 'Login'
+        LOGOUT = 5, 'Logout'
+        APPROVE = 6, 'Approve'
+        REJECT = 7, 'Reject'
+        SUBMIT = 8, 'Submit'
+
+    ACTION_CHOICES = Action.choices
     
     user = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True)
-    action = models.CharField(max_length=20, choices=ACTION_CHOICES, default='create')
+    action = models.PositiveSmallIntegerField(choices=Action.choices, default=Action.CREATE)
     model_name = models.CharField(max_length=100, default="")
     object_id = models.PositiveIntegerField(default=0)
     object_repr = models.CharField(max_length=200, default="")
     changes = models.JSONField(default=dict)
-    ip_address = models.GenericIPAddressField(null=True, blank=True)
+    ip_address = models.GenericIPAddressField(null=True, blank=True)  # native inet column on PostgreSQL
     user_agent = models.TextField(blank=True)
-    timestamp = models.DateTimeField(auto_now_add=True)
+    timestamp = models.DateTimeField(auto_now_add=True)  # only time column; audit rows carry no created_at/updated_at
 
     class Meta:
         ordering = ['-timestamp']
 
     def __str__(self):
-        return f"{self.action} {self.model_name} by {self.user} at {self.timestamp}"
+        return f"{self.get_action_display()} {self.model_name} by {self.user} at {self.timestamp}"
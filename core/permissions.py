@@ -1,8 +1,73 @@
+import json
+import time
+from functools import lru_cache
+
 from django.contrib.auth.models import User
 from django.core.cache import cache
 from django.utils import timezone
-from .models import UserRole, Permission, RolePermission, PermissionOverride
-from django.db import models
+from rest_framework import status
+from rest_framework.response import Response
+from .models import UserRole, RolePermission, PermissionOverride, current_assignment_q
+
+
+# Per-user entries depend on assignment start/end dates, so their TTL bounds how late a
+# scheduled start or expiry is seen. Changes made through the ORM are picked up at once
+# via the version keys below.
+USER_PERMISSION_CACHE_TIMEOUT = 300  # 5 minutes
+
+# Role permission lists have no time component and are only ever invalidated explicitly
+ROLE_PERMISSION_CACHE_TIMEOUT = 60 * 60 * 24  # 24 hours, bounds orphaned versions only
+
+# Permission index entry for a (resource_type, permission_type) the user holds nothing for
+_NO_GRANT = (False, frozenset(), ())
+
+
+def _new_cache_version():
+    # Seed from the clock so a version key lost to eviction never reuses an old value
+    return time.time_ns()
+
+
+def _permission_cache_version(user_id):
+    """Current cache version for a user's permission entries (global + per-user)"""
+    return _permission_cache_versions([user_id])[user_id]
+
+
+def _permission_cache_versions(user_ids):
+    """Current cache versions for several users with one get_many"""
+    return _cache_versions("user_perm_ver", user_ids)
+
+
+def _role_cache_versions(role_ids):
+    """Current cache versions for several roles' permission lists with one get_many"""
+    return _cache_versions("role_perm_ver", role_ids)
+
+
+def _cache_versions(prefix, ids):
+    """Combined global + per-id version strings for the given version key prefix"""
+    global_key = "perm_cache_ver"
+    id_keys = {pk: f"{prefix}_{pk}" for pk in ids}
+    keys = [global_key, *id_keys.values()]
+    versions = cache.get_many(keys)
+    
+    missing = {key: _new_cache_version() for key in keys if key not in versions}
+    if missing:
+        for key, version in missing.items():
+            if cache.add(key, version, None):
+                versions[key] = version
+            else:
+                versions[key] = cache.get(key, version)
+    
+    return {
+        pk: f"{versions[global_key]}_{versions[id_key]}"
+        for pk, id_key in id_keys.items()
+    }
+
+
+def _bump_cache_version(key):
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, _new_cache_version(), None)
 
 
 def get_user_permissions(user):
@@ -10,104 +75,209 @@ def get_user_permissions(user):
     Get all permissions for a user based on their roles and overrides.
     Returns a nested dictionary structure for easy permission checking.
     """
-    cache_key = f"user_permissions_{user.id}"
+    cache_key = f"user_permissions_{user.id}_{_permission_cache_version(user.id)}"
     permissions = cache.get(cache_key)
     
     if permissions is None:
         permissions = _build_user_permissions(user)
-        cache.set(cache_key, permissions, 300)  # Cache for 5 minutes
+        cache.set(cache_key, permissions, USER_PERMISSION_CACHE_TIMEOUT)
     
     return permissions
 
 
+def get_role_permissions_cached(role_ids):
+    """
+    Get the active permission entries of several roles, shared by every user
+    holding them. Hits come from one get_many; misses are loaded with one query.
+    
+    Returns:
+        dict: {role_id: tuple of (permission_id, codename, name, resource_type,
+               permission_type, conditions, conditions_key)}
+    """
+    role_ids = list(dict.fromkeys(role_ids))
+    if not role_ids:
+        return {}
+    
+    versions = _role_cache_versions(role_ids)
+    cache_keys = {role_id: f"role_permissions_{role_id}_{versions[role_id]}" for role_id in role_ids}
+    cached = cache.get_many(list(cache_keys.values()))
+    
+    results = {
+        role_id: cached[cache_key]
+        for role_id, cache_key in cache_keys.items()
+        if cache_key in cached
+    }
+    
+    missing = [role_id for role_id in role_ids if role_id not in results]
+    if missing:
+        loaded = {role_id: [] for role_id in missing}
+        rows = RolePermission.objects.filter(role_id__in=missing, is_active=True).values_list(
+            'role_id', 'permission_id', 'permission__codename', 'permission__name',
+            'permission__resource_type', 'permission__permission_type',
+            'has_conditions', 'conditions',
+        )
+        for role_id, permission_id, codename, name, resource_type, permission_type, has_conditions, conditions in rows:
+            loaded[role_id].append((
+                permission_id, codename, name, resource_type, permission_type,
+                conditions if has_conditions else {},
+                _conditions_key(conditions) if has_conditions else None,
+            ))
+        
+        built = {role_id: tuple(entries) for role_id, entries in loaded.items()}
+        cache.set_many({cache_keys[role_id]: entries for role_id, entries in built.items()}, ROLE_PERMISSION_CACHE_TIMEOUT)
+        results.update(built)
+    
+    return results
+
+
+def clear_role_permission_cache(role_id):
+    """Clear the shared permission list cached for a role"""
+    _bump_cache_version(f"role_perm_ver_{role_id}")
+
+
 def _build_user_permissions(user):
     """Build the complete permission structure for a user"""
     permissions = {}
+    now = timezone.now()
     
-    # Get all active role assignments for the user
-    user_roles = UserRole.objects.filter(
-        user=user,
-        is_active=True,
-        start_date__lte=timezone.now()
-    ).filter(
-        models.Q(end_date__isnull=True) | models.Q(end_date__gte=timezone.now())
-    ).select_related('role', 'department')
+    # Current role assignments; each role's permissions come from the shared role cache
+    user_roles = list(UserRole.objects.filter(user=user).current(now).values_list(
+        'role_id', 'role__name', 'department_id'
+    ))
+    role_permissions = get_role_permissions_cached(role_id for role_id, _, _ in user_roles)
     
     # Build permissions from roles
-    for user_role in user_roles:
-        role_permissions = RolePermission.objects.filter(
-            role=user_role.role,
-            is_active=True
-        ).select_related('permission')
-        
-        for role_perm in role_permissions:
-            perm = role_perm.permission
-            resource_type = perm.resource_type
-            permission_type = perm.permission_type
-            
-            # Initialize resource type if not exists
-            if resource_type not in permissions:
-                permissions[resource_type] = {}
-            
-            # Initialize permission type if not exists
-            if permission_type not in permissions[resource_type]:
-                permissions[resource_type][permission_type] = []
-            
+    for role_id, role_name, department_id in user_roles:
+        for (permission_id, codename, name, resource_type, permission_type,
+             conditions, conditions_key) in role_permissions[role_id]:
             # Add permission with conditions and scope
-            permission_data = {
-                'permission_id': perm.id,
-                'codename': perm.codename,
-                'name': perm.name,
-                'conditions': role_perm.conditions,
-                'department_scope': user_role.department.id if user_role.department else None,
-                'role_id': user_role.role.id,
-                'role_name': user_role.role.name,
-            }
-            
-            permissions[resource_type][permission_type].append(permission_data)
+            permissions.setdefault(resource_type, {}).setdefault(permission_type, []).append({
+                'permission_id': permission_id,
+                'codename': codename,
+                'name': name,
+                'conditions': conditions,
+                'conditions_key': conditions_key,
+                'department_scope': department_id,
+                'role_id': role_id,
+                'role_name': role_name,
+            })
     
     # Apply permission overrides
-    overrides = PermissionOverride.objects.filter(
-        user=user,
-        is_active=True,
-        start_date__lte=timezone.now()
-    ).filter(
-        models.Q(end_date__isnull=True) | models.Q(end_date__gte=timezone.now())
-    ).select_related('permission')
-    
-    for override in overrides:
-        perm = override.permission
-        resource_type = perm.resource_type
-        permission_type = perm.permission_type
-        
-        if override.override_type == 'deny':
-            # Remove permission if it exists
-            if resource_type in permissions and permission_type in permissions[resource_type]:
-                permissions[resource_type][permission_type] = [
-                    p for p in permissions[resource_type][permission_type]
-                    if p['permission_id'] != perm.id
-                ]
-        elif override.override_type == 'grant':
-            # Add permission if it doesn't exist
-            if resource_type not in permissions:
-                permissions[resource_type] = {}
-            if permission_type not in permissions[resource_type]:
-                permissions[resource_type][permission_type] = []
-            
-            permission_data = {
-                'permission_id': perm.id,
-                'codename': perm.codename,
-                'name': perm.name,
+    overrides = PermissionOverride.objects.filter(user=user).current(now).values_list(
+        'override_type', 'permission_id', 'permission__codename', 'permission__name',
+        'permission__resource_type', 'permission__permission_type',
+    )
+    
+    # Denials are collected into a set and applied in one pass rather than per override
+    denied_ids = set()
+    granted = {}
+    for override_type, permission_id, codename, name, resource_type, permission_type in overrides:
+        if override_type == 'deny':
+            # Remove permission if it exists (including a grant override seen earlier)
+            denied_ids.add(permission_id)
+            granted.pop(permission_id, None)
+        elif override_type == 'grant':
+            granted[permission_id] = (resource_type, permission_type, {
+                'permission_id': permission_id,
+                'codename': codename,
+                'name': name,
                 'conditions': {},
                 'department_scope': None,
                 'role_id': None,
                 'role_name': 'Override',
                 'override_type': 'grant',
-            }
-            
-            permissions[resource_type][permission_type].append(permission_data)
+            })
     
-    return permissions
+    if denied_ids:
+        for resource_permissions in permissions.values():
+            for permission_type, entries in resource_permissions.items():
+                resource_permissions[permission_type] = [
+                    p for p in entries if p['permission_id'] not in denied_ids
+                ]
+    
+    for resource_type, permission_type, permission_data in granted.values():
+        permissions.setdefault(resource_type, {}).setdefault(permission_type, []).append(permission_data)
+    
+    # Freeze the per-type entry lists so cached readers share an immutable, smaller pickle
+    return {
+        resource_type: {
+            permission_type: tuple(entries)
+            for permission_type, entries in resource_permissions.items()
+        }
+        for resource_type, resource_permissions in permissions.items()
+    }
+
+
+def get_permission_index(user):
+    """
+    Get a compact check index derived from the user's permission structure.
+    
+    Returns:
+        dict: {(resource_type, permission_type): (unscoped, department_scopes, conditioned)}
+            unscoped: an unconditioned grant with no department scope exists
+            department_scopes: frozenset of departments with an unconditioned grant
+            conditioned: tuple of (department_scope, conditions_key) still needing evaluation
+    """
+    cache_key = f"user_permission_index_{user.id}_{_permission_cache_version(user.id)}"
+    index = cache.get(cache_key)
+    
+    if index is None:
+        index = _build_permission_index(get_user_permissions(user))
+        cache.set(cache_key, index, USER_PERMISSION_CACHE_TIMEOUT)
+    
+    return index
+
+
+def get_permission_index_entry(user, permission_type, resource_type):
+    """
+    Get a single (resource_type, permission_type) entry of the permission index.
+    
+    Each entry is cached under its own key so a one-off check reads a few hundred
+    bytes instead of the whole index. On a miss the full index is loaded once and
+    all of its entries are written back in one set_many.
+    
+    Returns:
+        tuple: (unscoped, department_scopes, conditioned), see get_permission_index
+    """
+    version = _permission_cache_version(user.id)
+    cache_key = f"user_permission_entry_{user.id}_{version}_{resource_type}_{permission_type}"
+    entry = cache.get(cache_key)
+    
+    if entry is None:
+        index = get_permission_index(user)
+        entry = index.get((resource_type, permission_type), _NO_GRANT)
+        entries = {
+            f"user_permission_entry_{user.id}_{version}_{rt}_{pt}": value
+            for (rt, pt), value in index.items()
+        }
+        entries[cache_key] = entry
+        cache.set_many(entries, USER_PERMISSION_CACHE_TIMEOUT)
+    
+    return entry
+
+
+def _build_permission_index(user_permissions):
+    """Collapse the nested permission structure into per-(resource, type) scope sets"""
+    index = {}
+    for resource_type, resource_permissions in user_permissions.items():
+        for permission_type, entries in resource_permissions.items():
+            unscoped = False
+            department_scopes = set()
+            conditioned = set()
+            for permission_data in entries:
+                department_scope = permission_data['department_scope']
+                if permission_data['conditions']:
+                    conditions_key = permission_data.get('conditions_key') or _conditions_key(permission_data['conditions'])
+                    conditioned.add((department_scope, conditions_key))
+                elif department_scope is None:
+                    unscoped = True
+                else:
+                    department_scopes.add(department_scope)
+            if unscoped or department_scopes or conditioned:
+                index[(resource_type, permission_type)] = (
+                    unscoped, frozenset(department_scopes), tuple(conditioned),
+                )
+    return index
 
 
 def has_permission(user, permission_type, resource_type, **kwargs):
@@ -133,69 +303,169 @@ def has_permission(user, permission_type, resource_type, **kwargs):
     if user.is_superuser:
         return True
     
-    # Get user permissions
-    user_permissions = get_user_permissions(user)
+    return _entry_allows(get_permission_index_entry(user, permission_type, resource_type), **kwargs)
+
+
+def _index_allows(index, permission_type, resource_type, **kwargs):
+    """Check a permission against an already-fetched permission index"""
+    return _entry_allows(index.get((resource_type, permission_type), _NO_GRANT), **kwargs)
+
+
+def _entry_allows(entry, **kwargs):
+    """Check a single permission index entry against the request context"""
+    unscoped, department_scopes, conditioned = entry
+    if unscoped:
+        return True
     
-    # Check if user has the required permission type for the resource
-    if resource_type not in user_permissions:
-        return False
+    requested_department_id = kwargs.get('department_id')
+    if requested_department_id in department_scopes:
+        return True
+    
+    # Only grants with custom conditions need their predicate evaluated
+    for department_scope, conditions_key in conditioned:
+        if department_scope is not None and department_scope != requested_department_id:
+            continue
+        if _compile_conditions(conditions_key)(kwargs):
+            return True
     
-    if permission_type not in user_permissions[resource_type]:
+    return False
+
+
+def _get_request_permission_index(request):
+    """Get the request user's permission index, fetched from the cache at most once per request"""
+    index = getattr(request, '_permission_index', None)
+    if index is None:
+        index = get_permission_index(request.user)
+        request._permission_index = index
+    return index
+
+
+def request_has_permission(request, permission_type, resource_type, **kwargs):
+    """has_permission for request.user, reusing the permissions fetched earlier in the request"""
+    user = request.user
+    if not user.is_authenticated:
         return False
     
-    permissions = user_permissions[resource_type][permission_type]
+    if user.is_superuser:
+        return True
     
-    # Check each permission for the user
-    for permission_data in permissions:
-        if _check_permission_conditions(permission_data, **kwargs):
-            return True
+    return _index_allows(_get_request_permission_index(request), permission_type, resource_type, **kwargs)
+
+
+def has_permissions(user, checks, **kwargs):
+    """
+    Check several permissions for a user in one pass.
     
-    return False
+    Args:
+        user: The user to check permissions for
+        checks: Iterable of (permission_type, resource_type) pairs
+        **kwargs: Context passed to every check, as for has_permission
+    
+    Returns:
+        dict: {(permission_type, resource_type): bool} for each pair
+    """
+    checks = list(checks)
+    
+    if not user.is_authenticated:
+        return {check: False for check in checks}
+    
+    # Superusers have all permissions
+    if user.is_superuser:
+        return {check: True for check in checks}
+    
+    # Fetch the user's permission index once for all checks
+    index = get_permission_index(user)
+    
+    return {
+        (permission_type, resource_type): _index_allows(index, permission_type, resource_type, **kwargs)
+        for permission_type, resource_type in checks
+    }
 
 
-def _check_permission_conditions(permission_data, **kwargs):
-    """Check if permission conditions are met"""
-    conditions = permission_data.get('conditions', {})
-    department_scope = permission_data.get('department_scope')
+def allowed_department_scopes(user, permission_type, resource_type):
+    """
+    Resolve, in one pass, which departments a user holds a permission for.
+    List views call this once and test each row's department against the result.
+    
+    Returns:
+        tuple: (True, None) when the permission is unscoped (any department),
+               otherwise (False, frozenset of allowed department ids)
+    """
+    if not user.is_authenticated:
+        return False, frozenset()
     
-    # Check department scope
-    if department_scope is not None:
-        requested_department_id = kwargs.get('department_id')
-        if requested_department_id != department_scope:
-            return False
+    if user.is_superuser:
+        return True, None
     
-    # Check custom conditions
-    for condition_key, condition_value in conditions.items():
-        if condition_key in kwargs:
-            if kwargs[condition_key] != condition_value:
-                return False
-        else:
-            # If condition is required but not provided, deny permission
-            if condition_value is not None:
+    unscoped, department_scopes, conditioned = get_permission_index_entry(user, permission_type, resource_type)
+    if unscoped:
+        return True, None
+    
+    scopes = set(department_scopes)
+    for department_scope, conditions_key in conditioned:
+        if _compile_conditions(conditions_key)({'department_id': department_scope}):
+            if department_scope is None:
+                return True, None
+            scopes.add(department_scope)
+    
+    return False, frozenset(scopes)
+
+
+def has_any_permission(user, checks, **kwargs):
+    """Check if a user has at least one of the (permission_type, resource_type) pairs"""
+    return any(has_permissions(user, checks, **kwargs).values())
+
+
+def _conditions_key(conditions):
+    """Canonical string form of a conditions dict, used to memoize its predicate"""
+    return json.dumps(conditions, sort_keys=True)
+
+
+@lru_cache(maxsize=4096)
+def _compile_conditions(conditions_key):
+    """
+    Compile a conditions dict into a predicate over the check's context kwargs.
+    A condition passes when the context value equals it; a condition that is
+    not provided only passes if its required value is None.
+    """
+    items = tuple(json.loads(conditions_key).items())
+    
+    def predicate(context):
+        for condition_key, condition_value in items:
+            if context.get(condition_key) != condition_value:
                 return False
+        return True
     
-    return True
+    return predicate
 
 
 def get_user_roles(user):
     """Get all active roles for a user"""
-    cache_key = f"user_roles_{user.id}"
+    cache_key = f"user_roles_{user.id}_{_permission_cache_version(user.id)}"
     roles = cache.get(cache_key)
     
     if roles is None:
-        roles = list(UserRole.objects.filter(
-            user=user,
-            is_active=True,
-            start_date__lte=timezone.now()
-        ).filter(
-            models.Q(end_date__isnull=True) | models.Q(end_date__gte=timezone.now())
-        ).select_related('role', 'department'))
+        roles = list(UserRole.objects.filter(user=user).current().select_related('role', 'department'))
         
-        cache.set(cache_key, roles, 300)  # Cache for 5 minutes
+        cache.set(cache_key, roles, USER_PERMISSION_CACHE_TIMEOUT)
     
     return roles
 
 
+def _get_user_role_scopes(user):
+    """Get (role_codename, department_id) pairs for a user's current roles"""
+    cache_key = f"user_role_scopes_{user.id}_{_permission_cache_version(user.id)}"
+    scopes = cache.get(cache_key)
+    
+    if scopes is None:
+        # Plain tuples; role checks never need full UserRole instances
+        scopes = list(UserRole.objects.filter(user=user).current().values_list('role_codename', 'department_id'))
+        
+        cache.set(cache_key, scopes, USER_PERMISSION_CACHE_TIMEOUT)
+    
+    return scopes
+
+
 def has_role(user, role_codename, department_id=None):
     """Check if user has a specific role"""
     if not user.is_authenticated:
@@ -204,11 +474,9 @@ def has_role(user, role_codename, department_id=None):
     if user.is_superuser:
         return True
     
-    user_roles = get_user_roles(user)
-    
-    for user_role in user_roles:
-        if user_role.role.codename == role_codename:
-            if department_id is None or user_role.department_id == department_id:
+    for codename, role_department_id in _get_user_role_scopes(user):
+        if codename == role_codename:
+            if department_id is None or role_department_id == department_id:
                 return True
     
     return False
@@ -216,72 +484,139 @@ def has_role(user, role_codename, department_id=None):
 
 def get_users_with_permission(permission_type, resource_type, department_id=None):
     """Get all users who have a specific permission"""
+    now = timezone.now()
     
-    # Get all role permissions for this permission type and resource type
-    role_permissions = RolePermission.objects.filter(
+    # Get all roles granting this permission type and resource type
+    role_ids = RolePermission.objects.filter(
         permission__permission_type=permission_type,
         permission__resource_type=resource_type,
         is_active=True
-    ).select_related('role', 'permission')
-    
-    # Get users with these roles
-    user_ids = set()
-    
-    for role_perm in role_permissions:
-        user_roles = UserRole.objects.filter(
-            role=role_perm.role,
-            is_active=True,
-            start_date__lte=timezone.now()
-        ).filter(
-            models.Q(end_date__isnull=True) | models.Q(end_date__gte=timezone.now())
-        )
-        
-        if department_id is not None:
-            user_roles = user_roles.filter(department_id=department_id)
-        
-        user_ids.update(user_roles.values_list('user_id', flat=True))
+    ).values('role_id')
+    
+    # Get users with these roles in one query (role ids are resolved as a subquery)
+    user_roles = UserRole.objects.filter(role_id__in=role_ids).current(now)
+    
+    if department_id is not None:
+        user_roles = user_roles.filter(department_id=department_id)
     
-    # Add users with permission overrides
+    user_ids = set(user_roles.values_list('user_id', flat=True))
+    
+    # Grant and deny overrides in one query, bucketed in Python
     overrides = PermissionOverride.objects.filter(
         permission__permission_type=permission_type,
         permission__resource_type=resource_type,
-        override_type='grant',
-        is_active=True,
-        start_date__lte=timezone.now()
-    ).filter(
-        models.Q(end_date__isnull=True) | models.Q(end_date__gte=timezone.now())
-    )
+        override_type__in=['grant', 'deny'],
+    ).current(now).values_list('user_id', 'override_type')
     
-    user_ids.update(overrides.values_list('user_id', flat=True))
+    granted_user_ids, denied_user_ids = set(), set()
+    for user_id, override_type in overrides:
+        if override_type == 'grant':
+            granted_user_ids.add(user_id)
+        else:
+            denied_user_ids.add(user_id)
     
-    # Remove users with deny overrides
-    deny_overrides = PermissionOverride.objects.filter(
-        permission__permission_type=permission_type,
-        permission__resource_type=resource_type,
-        override_type='deny',
+    # Add users with grant overrides, then remove users with deny overrides
+    user_ids = (user_ids | granted_user_ids) - denied_user_ids
+    
+    return User.objects.filter(id__in=user_ids)
+
+
+def effective_permissions(user_id):
+    """
+    Get the flat set of permission codenames a user currently holds.
+    Cached per user and invalidated by signals when roles or overrides change.
+    
+    Only unscoped, unconditioned grants are included: a grant limited to a
+    department or carrying custom conditions is left out, so checks that depend
+    on scope or conditions must go through has_permission.
+    """
+    return effective_permissions_bulk([user_id])[user_id]
+
+
+def effective_permissions_bulk(user_ids):
+    """
+    Get effective permission codenames for many users at once.
+    Cache hits come from one get_many; misses are built with one role query and
+    one override query for all of them, then stored with one set_many.
+    Like effective_permissions, department-scoped and conditioned grants are excluded.
+    
+    Returns:
+        dict: {user_id: frozenset of codenames}
+    """
+    user_ids = list(dict.fromkeys(user_ids))
+    versions = _permission_cache_versions(user_ids)
+    cache_keys = {
+        user_id: f"user_effective_permissions_v2_{user_id}_{versions[user_id]}"
+        for user_id in user_ids
+    }
+    cached = cache.get_many(list(cache_keys.values()))
+    
+    results = {
+        user_id: cached[cache_key]
+        for user_id, cache_key in cache_keys.items()
+        if cache_key in cached
+    }
+    
+    missing = [user_id for user_id in user_ids if user_id not in results]
+    if missing:
+        granted = _resolve_granted(missing, 'permission__codename')
+        built = {user_id: frozenset(codenames) for user_id, codenames in granted.items()}
+        cache.set_many({cache_keys[user_id]: codenames for user_id, codenames in built.items()}, USER_PERMISSION_CACHE_TIMEOUT)
+        results.update(built)
+    
+    return results
+
+
+def _resolve_granted(user_ids, field):
+    """
+    Resolve the permissions (as the given Permission field) each user holds through
+    current roles and overrides: one role query and one override query in total.
+    
+    Role grants scoped to a department or carrying conditions are skipped, since a
+    flat set cannot express them; grant overrides are unscoped, as in has_permission.
+    """
+    now = timezone.now()
+    granted = {user_id: set() for user_id in user_ids}
+    
+    role_permissions = RolePermission.objects.filter(
+        current_assignment_q(now, prefix='role__user_roles__'),
+        role__user_roles__user_id__in=user_ids,
+        role__user_roles__department__isnull=True,
+        role__is_active=True,
+        has_conditions=False,
         is_active=True,
-        start_date__lte=timezone.now()
-    ).filter(
-        models.Q(end_date__isnull=True) | models.Q(end_date__gte=timezone.now())
-    )
+    ).values_list('role__user_roles__user_id', field)
+    for user_id, value in role_permissions:
+        granted[user_id].add(value)
     
-    denied_user_ids = set(deny_overrides.values_list('user_id', flat=True))
-    user_ids = user_ids - denied_user_ids
+    overrides = PermissionOverride.objects.filter(user_id__in=user_ids).current(now).values_list(
+        'user_id', 'override_type', field
+    )
+    for user_id, override_type, value in overrides:
+        if override_type == 'grant':
+            granted[user_id].add(value)
+        elif override_type == 'deny':
+            granted[user_id].discard(value)
     
-    return User.objects.filter(id__in=user_ids)
+    return granted
 
 
 def clear_user_permission_cache(user_id):
     """Clear permission cache for a specific user"""
-    cache.delete(f"user_permissions_{user_id}")
-    cache.delete(f"user_roles_{user_id}")
+    # Bumping the version orphans every cached entry for the user; they expire via TTL
+    _bump_cache_version(f"user_perm_ver_{user_id}")
+
+
+def clear_users_permission_cache(user_ids):
+    """Clear permission caches for several users with a single set_many"""
+    versions = {f"user_perm_ver_{user_id}": _new_cache_version() for user_id in set(user_ids)}
+    if versions:
+        cache.set_many(versions, None)
 
 
 def clear_all_permission_caches():
     """Clear all permission caches (use sparingly)"""
-    # This is a simple approach - in production you might want to use cache versioning
-    # or more sophisticated cache invalidation
-    pass
+    _bump_cache_version("perm_cache_ver")
 
 
 # Permission decorators for views
@@ -289,9 +624,12 @@ def require_permission(permission_type, resource_type):
     """Decorator to require a specific permission for a view"""
     def decorator(view_func):
         def wrapper(request, *args, **kwargs):
-            if not has_permission(request.user, permission_type, resource_type):
-                from rest_framework.response import Response
-                from rest_framework import status
+            # Authentication and superuser status are settled here, once, before any lookup
+            user = request.user
+            if not user.is_authenticated or not (
+                user.is_superuser
+                or _index_allows(_get_request_permission_index(request), permission_type, resource_type)
+            ):
                 return Response({'error': 'Permission denied'}, status=status.HTTP_403_FORBIDDEN)
             return view_func(request, *args, **kwargs)
         return wrapper
@@ -302,9 +640,10 @@ def require_role(role_codename, department_id=None):
     """Decorator to require a specific role for a view"""
     def decorator(view_func):
         def wrapper(request, *args, **kwargs):
-            if not has_role(request.user, role_codename, department_id):
-                from rest_framework.response import Response
-                from rest_framework import status
+            user = request.user
+            if not user.is_authenticated or not (
+                user.is_superuser or has_role(user, role_codename, department_id)
+            ):
                 return Response({'error': 'Role required'}, status=status.HTTP_403_FORBIDDEN)
             return view_func(request, *args, **kwargs)
         return wrapper
@@ -319,9 +658,9 @@ def can_manage_users(user, department_id=None):
 
 def can_manage_roles(user, department_id=None):
     """Check if user can manage roles"""
-    return has_permission(user, 'create', 'role', department_id=department_id) or \
-           has_permission(user, 'update', 'role', department_id=department_id) or \
-           has_permission(user, 'delete', 'role', department_id=department_id)
+    return has_any_permission(
+        user, [('create', 'role'), ('update', 'role'), ('delete', 'role')], department_id=department_id
+    )
 
 
 def can_approve_evaluations(user, department_id=None):
@@ -354,13 +693,15 @@ def is_supervisor_user(user):
     return has_role(user, 'supervisor')
 
 
+def get_user_department_ids(user):
+    """Get the ids of departments the user holds a current role in (served from cache)"""
+    return sorted({
+        department_id
+        for _, department_id in _get_user_role_scopes(user)
+        if department_id is not None
+    })
+
+
 def get_user_department_scope(user):
     """Get the department scope for a user's permissions"""
-    user_roles = get_user_roles(user)
-    departments = set()
-    
-    for user_role in user_roles:
-        if user_role.department:
-            departments.add(user_role.department.id)
-    
-    return list(departments) if departments else None 
\ No newline at end of file
+    return get_user_department_ids(user) or None
@@ -0,0 +1,269 @@
+import csv
+import os
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.core.exceptions import ValidationError
+from django.db import DataError, IntegrityError, transaction
+from django.utils import timezone
+
+from users.models import UserProfile
+from .audit import AuditBatch
+from .models import AuditLog, Department, Position, Role, UserRole
+
+
+BATCH_SIZE = 1000
+
+# Errors caused by the request payload; anything else is a server error and propagates
+CLIENT_ERRORS = (KeyError, TypeError, ValueError, ValidationError, IntegrityError, DataError)
+
+
+def csv_user_rows(text_stream):
+    """Lazily map the rows of a bulk registration CSV to user dicts"""
+    for row in csv.DictReader(text_stream):
+        yield {
+            'username': row['username'],
+            'email': row['email'],
+            'first_name': row.get('first_name', ''),
+            'last_name': row.get('last_name', ''),
+            'password': row.get('password', 'defaultpassword123'),
+            'department_id': row.get('department_id'),
+            'position_id': row.get('position_id'),
+            'employee_id': row.get('employee_id', ''),
+            'phone_number': row.get('phone_number', ''),
+        }
+
+
+def register_users(users_data, actor, ip_address=None, user_agent='', progress=None):
+    """
+    Create users, profiles and role assignments from an iterable of user dicts,
+    recording actor as the assigner and in the audit log.
+    
+    The input is consumed BATCH_SIZE rows at a time, so a streamed upload never
+    has to be held in memory as a whole. progress, if given, is called after
+    every batch with (processed, created, errors) counts.
+    
+    Returns:
+        tuple: (created_users, errors), both lists of dicts for the response
+    """
+    created_users = []
+    errors = []
+    seen_usernames = set()
+    seen_employee_ids = set()
+    
+    # One timestamp for every assignment in the upload that has no start_date
+    now = timezone.now()
+    
+    def record_error(username, error):
+        errors.append({'username': username, 'error': str(error)})
+    
+    processed = 0
+    users_data = iter(users_data)
+    with AuditBatch() as audit:
+        while True:
+            batch = list(islice(users_data, BATCH_SIZE))
+            if not batch:
+                break
+            
+            rows = _validate_users(batch, record_error, seen_usernames, seen_employee_ids)
+            
+            # Users, then profiles, then role assignments, each written with batched INSERTs
+            passwords = _hash_passwords([row['password'] for row in rows])
+            users = [
+                User(
+                    username=row['username'],
+                    email=row['email'],
+                    first_name=row['first_name'],
+                    last_name=row['last_name'],
+                    password=password,
+                )
+                for row, password in zip(rows, passwords)
+            ]
+            users = _bulk_create_in_batches(User, users, lambda user, e: record_error(user.username, e))
+            
+            # Re-read ids by username; not every backend returns primary keys from bulk_create
+            users_by_username = User.objects.filter(
+                username__in=[user.username for user in users]
+            ).in_bulk(field_name='username')
+            rows = [row for row in rows if row['username'] in users_by_username]
+            
+            profiles = _bulk_create_in_batches(UserProfile, [
+                UserProfile(
+                    user=users_by_username[row['username']],
+                    department_id=row['department_id'],
+                    position_id=row['position_id'],
+                    employee_id=row['employee_id'],
+                    phone_number=row['phone_number'],
+                    date_of_birth=row['date_of_birth'],
+                ) for row in rows
+            ], lambda profile, e: record_error(profile.user.username, e))
+            profiled_usernames = {profile.user.username for profile in profiles}
+            
+            user_roles = _bulk_create_in_batches(UserRole, [
+                UserRole(
+                    user=users_by_username[row['username']],
+                    role=role,
+                    role_codename=role.codename,
+                    department_id=role_data['department_id'],
+                    # bulk_create bypasses save(); uploaded assignments carry no conditions
+                    has_conditions=False,
+                    start_date=role_data['start_date'] or now,
+                    end_date=role_data['end_date'],
+                    assigned_by=actor,
+                    reason=role_data['reason'],
+                )
+                for row in rows if row['username'] in profiled_usernames
+                for role, role_data in row['roles']
+            ], lambda user_role, e: record_error(user_role.user.username, e))
+            
+            for user_role in user_roles:
+                audit.log(
+                    user=actor,
+                    action=AuditLog.Action.CREATE,
+                    model_name='UserRole',
+                    object_id=user_role.pk or 0,
+                    object_repr=str(user_role),
+                    ip_address=ip_address,
+                    user_agent=user_agent,
+                )
+            audit.flush()
+            
+            created_users.extend({
+                'id': profile.user.id,
+                'username': profile.user.username,
+                'email': profile.user.email,
+                'employee_id': profile.employee_id,
+            } for profile in profiles)
+            
+            processed += len(batch)
+            if progress is not None:
+                progress(processed, len(created_users), len(errors))
+    
+    return created_users, errors
+
+
+def _hash_passwords(raw_passwords):
+    """
+    Hash passwords with the configured hasher across a thread pool.
+    
+    PBKDF2 dominates bulk registration time; hashlib releases the GIL while it
+    runs, so threads hash on every core without weakening the hasher.
+    """
+    if len(raw_passwords) < 2:
+        return [make_password(raw_password) for raw_password in raw_passwords]
+    with ThreadPoolExecutor(max_workers=min(len(raw_passwords), os.cpu_count() or 1)) as executor:
+        return list(executor.map(make_password, raw_passwords))
+
+
+def _optional_id(value):
+    """Normalize an optional foreign key id from JSON or CSV input ('' means unset)"""
+    if value in (None, ''):
+        return None
+    return int(value)
+
+
+def _validate_users(users_data, record_error, seen_usernames, seen_employee_ids):
+    """
+    Normalize bulk registration rows and drop the ones that would violate a
+    constraint, reporting each through record_error(username, message).
+    seen_usernames and seen_employee_ids carry the rows accepted from earlier
+    batches of the same upload and are updated in place.
+    
+    Existing usernames, employee ids, departments, positions and roles are each
+    resolved with one query so the batched inserts that follow rarely fail.
+    """
+    rows = []
+    for user_data in users_data:
+        username = user_data.get('username', 'Unknown')
+        try:
+            roles = [{
+                'role_id': int(role_data['role_id']),
+                'department_id': _optional_id(role_data.get('department_id')),
+                'start_date': role_data.get('start_date'),
+                'end_date': role_data.get('end_date'),
+                'reason': role_data.get('reason', 'Bulk registration'),
+            } for role_data in user_data.get('roles') or []]
+            rows.append({
+                'username': User.normalize_username(user_data['username']),
+                'email': User.objects.normalize_email(user_data['email']),
+                'password': user_data.get('password', 'defaultpassword123'),
+                'first_name': user_data.get('first_name', ''),
+                'last_name': user_data.get('last_name', ''),
+                'department_id': _optional_id(user_data.get('department_id')),
+                'position_id': _optional_id(user_data.get('position_id')),
+                'employee_id': user_data.get('employee_id', ''),
+                'phone_number': user_data.get('phone_number', ''),
+                'date_of_birth': user_data.get('date_of_birth') or None,
+                'roles': roles,
+            })
+        except (KeyError, TypeError, ValueError) as e:
+            record_error(username, e)
+    
+    existing_usernames = seen_usernames | set(User.objects.filter(
+        username__in=[row['username'] for row in rows]
+    ).values_list('username', flat=True))
+    existing_employee_ids = seen_employee_ids | set(UserProfile.objects.filter(
+        employee_id__in=[row['employee_id'] for row in rows]
+    ).values_list('employee_id', flat=True))
+    department_ids = set(Department.objects.filter(id__in={
+        department_id
+        for row in rows
+        for department_id in [row['department_id'], *(r['department_id'] for r in row['roles'])]
+        if department_id is not None
+    }).values_list('id', flat=True))
+    position_ids = set(Position.objects.filter(
+        id__in={row['position_id'] for row in rows if row['position_id'] is not None}
+    ).values_list('id', flat=True))
+    roles_by_id = Role.objects.in_bulk({r['role_id'] for row in rows for r in row['roles']})
+    
+    valid_rows = []
+    for row in rows:
+        department_refs = [row['department_id'], *(r['department_id'] for r in row['roles'])]
+        if row['username'] in existing_usernames:
+            error = 'Username already exists'
+        elif row['employee_id'] in existing_employee_ids:
+            error = 'Employee ID already exists'
+        elif any(d is not None and d not in department_ids for d in department_refs):
+            error = 'Department not found'
+        elif row['position_id'] is not None and row['position_id'] not in position_ids:
+            error = 'Position not found'
+        elif any(r['role_id'] not in roles_by_id for r in row['roles']):
+            error = 'Role not found'
+        else:
+            # Later duplicates within the same upload collide with this row
+            existing_usernames.add(row['username'])
+            existing_employee_ids.add(row['employee_id'])
+            seen_usernames.add(row['username'])
+            seen_employee_ids.add(row['employee_id'])
+            row['roles'] = [(roles_by_id[r['role_id']], r) for r in row['roles']]
+            valid_rows.append(row)
+            continue
+        record_error(row['username'], error)
+    
+    return valid_rows
+
+
+def _bulk_create_in_batches(model, objs, on_error):
+    """
+    bulk_create objs in batches, each under its own savepoint. A batch that hits
+    a constraint is retried row by row so only the offending rows are reported
+    through on_error(obj, exception); returns the objects that were saved.
+    """
+    created = []
+    for start in range(0, len(objs), BATCH_SIZE):
+        batch = objs[start:start + BATCH_SIZE]
+        try:
+            with transaction.atomic():
+                created.extend(model.objects.bulk_create(batch))
+        except IntegrityError:
+            for obj in batch:
+                obj.pk = None
+                try:
+                    with transaction.atomic():
+                        obj.save()
+                    created.append(obj)
+                except IntegrityError as e:
+                    on_error(obj, e)
+    return created
@@ -0,0 +1,48 @@
+from django.db.models.signals import post_save, post_delete
+from django.core.cache import cache
+from django.dispatch import receiver
+
+from .models import (
+    CONFIG_LIST_CACHE_KEY, Permission, Role, UserRole, RolePermission, PermissionOverride, SystemConfiguration,
+)
+from .permissions import (
+    clear_all_permission_caches, clear_role_permission_cache,
+    clear_user_permission_cache, clear_users_permission_cache,
+)
+
+
+@receiver([post_save, post_delete], sender=Permission)
+def invalidate_permission_entries(sender, instance, **kwargs):
+    """Drop cached permission entries, which embed Permission fields, after any Permission change"""
+    clear_all_permission_caches()
+
+
+@receiver(post_save, sender=Role)
+def sync_user_role_codenames(sender, instance, **kwargs):
+    """Keep the denormalized UserRole.role_codename in step with the role"""
+    stale = UserRole.objects.filter(role=instance).exclude(role_codename=instance.codename)
+    user_ids = list(stale.values_list('user_id', flat=True).distinct())
+    if user_ids:
+        stale.update(role_codename=instance.codename)
+        clear_users_permission_cache(user_ids)
+
+
+@receiver([post_save, post_delete], sender=UserRole)
+@receiver([post_save, post_delete], sender=PermissionOverride)
+def invalidate_user_permissions(sender, instance, **kwargs):
+    """Drop cached permissions for the user whose assignment changed"""
+    clear_user_permission_cache(instance.user_id)
+
+
+@receiver([post_save, post_delete], sender=RolePermission)
+def invalidate_role_permissions(sender, instance, **kwargs):
+    """Drop the role's shared permission list and every holder's cached permissions"""
+    clear_role_permission_cache(instance.role_id)
+    user_ids = UserRole.objects.filter(role_id=instance.role_id).values_list('user_id', flat=True).distinct()
+    clear_users_permission_cache(user_ids)
+
+
+@receiver([post_save, post_delete], sender=SystemConfiguration)
+def invalidate_system_configuration(sender, instance, **kwargs):
+    """Drop the cached value and the cached listing after any configuration change"""
+    cache.delete_many([f"config_{instance.key}", CONFIG_LIST_CACHE_KEY])
@@ -0,0 +1,77 @@
+import csv
+from io import TextIOWrapper
+
+from celery import shared_task
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.files.storage import default_storage
+from django.db import transaction
+
+from .permissions import get_permission_index
+from .registration import CLIENT_ERRORS, csv_user_rows, register_users
+
+
+# Finished job results stay readable for a day
+BULK_REGISTRATION_JOB_TIMEOUT = 60 * 60 * 24
+
+
+def bulk_registration_job_key(job_id):
+    return f"bulk_registration_job_{job_id}"
+
+
+def set_bulk_registration_job(job_id, **state):
+    cache.set(bulk_registration_job_key(job_id), {'job_id': job_id, **state}, BULK_REGISTRATION_JOB_TIMEOUT)
+
+
+def get_bulk_registration_job(job_id):
+    return cache.get(bulk_registration_job_key(job_id))
+
+
+@shared_task
+def bulk_register_users_csv(job_id, upload_name, actor_id, ip_address=None, user_agent=''):
+    """
+    Register the users of a stored CSV upload, publishing progress after every
+    batch under the job's cache key. The upload is deleted when the job ends.
+    """
+    def progress(processed, created, errors):
+        set_bulk_registration_job(
+            job_id, status='running', processed=processed, total_created=created, total_errors=errors,
+        )
+
+    try:
+        actor = User.objects.get(pk=actor_id)
+        with default_storage.open(upload_name, 'rb') as upload, transaction.atomic():
+            created_users, errors = register_users(
+                csv_user_rows(TextIOWrapper(upload, encoding='utf-8', newline='')),
+                actor, ip_address=ip_address, user_agent=user_agent, progress=progress,
+            )
+    except User.DoesNotExist:
+        set_bulk_registration_job(job_id, status='failed', error='The requesting user no longer exists')
+        return
+    except (*CLIENT_ERRORS, csv.Error) as e:
+        set_bulk_registration_job(job_id, status='failed', error=str(e))
+        return
+    except Exception:
+        # Never leave pollers on a pending/running job; re-raise so Celery records the failure
+        set_bulk_registration_job(job_id, status='failed', error='Bulk registration failed unexpectedly')
+        raise
+    finally:
+        default_storage.delete(upload_name)
+
+    set_bulk_registration_job(
+        job_id,
+        status='completed',
+        processed=len(created_users) + len(errors),
+        created_users=created_users,
+        errors=errors,
+        total_created=len(created_users),
+        total_errors=len(errors),
+    )
+
+
+@shared_task
+def warm_user_permission_cache(user_id):
+    """Rebuild a user's cached permissions so their next request starts on a warm cache"""
+    user = User.objects.filter(pk=user_id).first()
+    if user is not None:
+        get_permission_index(user)
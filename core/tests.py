@@ -1,3 +1,241 @@
-from django.test import TestCase
+from datetime import timedelta
 
-# Create your tests here.
+from django.contrib.auth.models import AnonymousUser, User
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from .models import (
+    Department, Permission, PermissionOverride, Role, RolePermission, RolePermissionCondition,
+    SystemConfiguration, UserRole,
+)
+from .permissions import allowed_department_scopes, effective_permissions, has_permission, has_permissions, has_role
+
+
+LOCMEM_CACHES = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}
+
+
+def baseline_has_permission(user, permission_type, resource_type, **kwargs):
+    """
+    Reference resolver: the uncached rules has_permission must keep, read
+    straight from the current rows on every call.
+    """
+    if not user.is_authenticated:
+        return False
+    if user.is_superuser:
+        return True
+
+    now = timezone.now()
+    entries = []
+    for user_role in UserRole.objects.filter(user=user).current(now):
+        for role_permission in RolePermission.objects.filter(role=user_role.role, is_active=True).select_related('permission'):
+            entries.append((role_permission.permission, role_permission.conditions, user_role.department_id))
+
+    for override in PermissionOverride.objects.filter(user=user).current(now).select_related('permission'):
+        if override.override_type == 'deny':
+            entries = [entry for entry in entries if entry[0].pk != override.permission_id]
+        elif override.override_type == 'grant':
+            entries.append((override.permission, {}, None))
+
+    for permission, conditions, department_scope in entries:
+        if (permission.permission_type, permission.resource_type) != (permission_type, resource_type):
+            continue
+        if department_scope is not None and kwargs.get('department_id') != department_scope:
+            continue
+        if all(
+            kwargs[key] == value if key in kwargs else value is None
+            for key, value in conditions.items()
+        ):
+            return True
+    return False
+
+
+class PermissionTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def make_permission(self, permission_type, resource_type):
+        return Permission.objects.create(
+            codename=f"{permission_type}_{resource_type}",
+            name=f"{permission_type} {resource_type}",
+            permission_type=permission_type,
+            resource_type=resource_type,
+        )
+
+    def make_role(self, codename, *grants):
+        role = Role.objects.create(name=codename.title(), codename=codename, role_level='mid')
+        for permission, conditions in grants:
+            RolePermission.objects.create(role=role, permission=permission, conditions=conditions)
+        return role
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class HasPermissionTests(PermissionTestCase):
+    def setUp(self):
+        super().setUp()
+        self.user = User.objects.create_user('alice')
+        self.engineering = Department.objects.create(name='Engineering', code='ENG')
+        self.operations = Department.objects.create(name='Operations', code='OPS')
+
+        read_role = self.make_permission('read', 'role')
+        update_role = self.make_permission('update', 'role')
+        delete_role = self.make_permission('delete', 'role')
+        approve = self.make_permission('approve', 'evaluation')
+        export = self.make_permission('export', 'report')
+        read_user = self.make_permission('read', 'user')
+        manage_users = self.make_permission('manage_users', 'user')
+        analytics = self.make_permission('view_analytics', 'analytics')
+
+        now = timezone.now()
+        UserRole.objects.create(user=self.user, role=self.make_role(
+            'staff', (read_role, {}), (update_role, {'own': True}), (export, {}),
+        ))
+        UserRole.objects.create(user=self.user, department=self.engineering, role=self.make_role(
+            'lead', (delete_role, {}), (approve, {'level': 'senior'}),
+        ))
+        UserRole.objects.create(
+            user=self.user, role=self.make_role('former', (manage_users, {})),
+            start_date=now - timedelta(days=30), end_date=now - timedelta(days=1),
+        )
+        UserRole.objects.create(
+            user=self.user, role=self.make_role('incoming', (analytics, {})),
+            start_date=now + timedelta(days=1),
+        )
+        PermissionOverride.objects.create(user=self.user, permission=export, override_type='deny')
+        PermissionOverride.objects.create(user=self.user, permission=read_user, override_type='grant')
+
+        self.checks = [
+            ('read', 'role'), ('update', 'role'), ('delete', 'role'), ('approve', 'evaluation'),
+            ('export', 'report'), ('read', 'user'), ('manage_users', 'user'), ('view_analytics', 'analytics'),
+        ]
+        self.contexts = [
+            {},
+            {'department_id': self.engineering.pk},
+            {'department_id': self.operations.pk},
+            {'own': True},
+            {'own': False},
+            {'department_id': self.engineering.pk, 'level': 'senior'},
+            {'department_id': self.engineering.pk, 'level': 'junior'},
+        ]
+
+    def test_matches_baseline_resolution(self):
+        for permission_type, resource_type in self.checks:
+            for context in self.contexts:
+                with self.subTest(check=(permission_type, resource_type), context=context):
+                    self.assertEqual(
+                        has_permission(self.user, permission_type, resource_type, **context),
+                        baseline_has_permission(self.user, permission_type, resource_type, **context),
+                    )
+
+    def test_scopes_conditions_and_overrides(self):
+        engineering = self.engineering.pk
+        self.assertTrue(has_permission(self.user, 'read', 'role'))
+        self.assertTrue(has_permission(self.user, 'update', 'role', own=True))
+        self.assertFalse(has_permission(self.user, 'update', 'role'))
+        self.assertTrue(has_permission(self.user, 'delete', 'role', department_id=engineering))
+        self.assertFalse(has_permission(self.user, 'delete', 'role', department_id=self.operations.pk))
+        self.assertTrue(has_permission(self.user, 'approve', 'evaluation', department_id=engineering, level='senior'))
+        self.assertFalse(has_permission(self.user, 'approve', 'evaluation', department_id=engineering))
+        self.assertFalse(has_permission(self.user, 'export', 'report'))
+        self.assertTrue(has_permission(self.user, 'read', 'user'))
+        self.assertFalse(has_permission(self.user, 'manage_users', 'user'))
+        self.assertFalse(has_permission(self.user, 'view_analytics', 'analytics'))
+
+    def test_bulk_checks_match_single_checks(self):
+        for context in self.contexts:
+            with self.subTest(context=context):
+                self.assertEqual(
+                    has_permissions(self.user, self.checks, **context),
+                    {check: has_permission(self.user, *check, **context) for check in self.checks},
+                )
+        self.assertEqual(allowed_department_scopes(self.user, 'delete', 'role'), (False, frozenset({self.engineering.pk})))
+        self.assertEqual(allowed_department_scopes(self.user, 'read', 'role'), (True, None))
+
+    def test_effective_permissions_hold_only_unscoped_unconditioned_grants(self):
+        self.assertEqual(effective_permissions(self.user.pk), frozenset({'read_role', 'read_user'}))
+
+    def test_superuser_and_anonymous(self):
+        superuser = User.objects.create_superuser('root', 'root@example.com', 'pw')
+        self.assertTrue(has_permission(superuser, 'delete', 'role'))
+        self.assertFalse(has_permission(AnonymousUser(), 'read', 'role'))
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class CacheInvalidationTests(PermissionTestCase):
+    def setUp(self):
+        super().setUp()
+        self.user = User.objects.create_user('bob')
+        self.read_role = self.make_permission('read', 'role')
+        self.update_role = self.make_permission('update', 'role')
+        self.role = self.make_role('staff', (self.read_role, {}))
+        self.assignment = UserRole.objects.create(user=self.user, role=self.role)
+        # Warm every cached layer before each change
+        self.assertTrue(has_permission(self.user, 'read', 'role'))
+        self.assertFalse(has_permission(self.user, 'update', 'role'))
+        self.assertEqual(effective_permissions(self.user.pk), frozenset({'read_role'}))
+
+    def test_role_permission_changes(self):
+        role_permission = RolePermission.objects.create(role=self.role, permission=self.update_role)
+        self.assertTrue(has_permission(self.user, 'update', 'role'))
+        self.assertIn('update_role', effective_permissions(self.user.pk))
+
+        role_permission.conditions = {'own': True}
+        role_permission.save()
+        self.assertFalse(has_permission(self.user, 'update', 'role'))
+        self.assertTrue(has_permission(self.user, 'update', 'role', own=True))
+        self.assertEqual(
+            list(RolePermissionCondition.objects.filter(role_permission=role_permission).values_list('key', 'value')),
+            [('own', True)],
+        )
+
+        role_permission.delete()
+        self.assertFalse(has_permission(self.user, 'update', 'role', own=True))
+
+    def test_assignment_changes(self):
+        self.assignment.is_active = False
+        self.assignment.save()
+        self.assertFalse(has_permission(self.user, 'read', 'role'))
+
+        self.assignment.is_active = True
+        self.assignment.save()
+        self.assertTrue(has_permission(self.user, 'read', 'role'))
+
+        self.assignment.delete()
+        self.assertFalse(has_permission(self.user, 'read', 'role'))
+        self.assertEqual(effective_permissions(self.user.pk), frozenset())
+
+    def test_override_changes(self):
+        deny = PermissionOverride.objects.create(user=self.user, permission=self.read_role, override_type='deny')
+        self.assertFalse(has_permission(self.user, 'read', 'role'))
+        deny.delete()
+        self.assertTrue(has_permission(self.user, 'read', 'role'))
+
+        PermissionOverride.objects.create(user=self.user, permission=self.update_role, override_type='grant')
+        self.assertTrue(has_permission(self.user, 'update', 'role'))
+
+    def test_permission_changes(self):
+        self.read_role.permission_type = 'update'
+        self.read_role.save()
+        self.assertTrue(has_permission(self.user, 'update', 'role'))
+        self.assertFalse(has_permission(self.user, 'read', 'role'))
+
+    def test_role_codename_changes(self):
+        self.assertTrue(has_role(self.user, 'staff'))
+        self.role.codename = 'member'
+        self.role.save()
+        self.assertFalse(has_role(self.user, 'staff'))
+        self.assertTrue(has_role(self.user, 'member'))
+
+    def test_system_configuration_changes(self):
+        config = SystemConfiguration.objects.create(key='max_reviews', value='3')
+        self.assertEqual(SystemConfiguration.get_value('max_reviews'), '3')
+        self.assertEqual([row['value'] for row in SystemConfiguration.get_active_list()], ['3'])
+
+        config.value = '5'
+        config.save()
+        self.assertEqual(SystemConfiguration.get_value('max_reviews'), '5')
+        self.assertEqual([row['value'] for row in SystemConfiguration.get_active_list()], ['5'])
+
+        config.delete()
+        self.assertIsNone(SystemConfiguration.get_value('max_reviews'))
+        self.assertEqual(SystemConfiguration.get_active_list(), [])
@@ -27,6 +27,7 @@ urlpatterns = [
     # ============================================================================
     path('bulk-register/', views.bulk_user_registration, name='bulk_user_registration'),
     path('bulk-register-csv/', views.bulk_user_registration_csv, name='bulk_user_registration_csv'),
+    path('bulk-register-jobs/<str:job_id>/', views.bulk_registration_job, name='bulk_registration_job'),
     
     # ============================================================================
     # SYSTEM CONFIGURATION URLs
@@ -3,7 +3,10 @@ from django.http import JsonResponse
 from django.views.decorators.csrf import csrf_exempt
 from django.contrib.auth.decorators import login_required, permission_required
 from django.contrib.auth.models import User
+from django.core.exceptions import ValidationError
+from django.core.files.storage import default_storage
 from django.db import transaction
+from django.db.models import Count, Q
 from django.core.paginator import Paginator
 from django.utils import timezone
 from rest_framework.decorators import api_view, permission_classes
@@ -11,17 +14,30 @@ from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework import status
 import json
-import csv
-from io import StringIO
+import uuid
 
 from .models import (
     Department, Position, Permission, Role, RolePermission, 
     UserRole, PermissionOverride, PermissionAudit, PermissionGroup,
     SystemConfiguration, ApprovalLevel, ApprovalWorkflow
 )
-from .permissions import has_permission, get_user_permissions
+from .registration import CLIENT_ERRORS, register_users
+from .tasks import (
+    bulk_register_users_csv, get_bulk_registration_job, set_bulk_registration_job, warm_user_permission_cache,
+)
+from .permissions import request_has_permission, allowed_department_scopes
 from evaluations.models import EvaluationQuestion, KPITemplate, AppraisalFormTemplate
-from users.models import UserProfile
+
+
+def _client_error_response(error):
+    """400 response describing a payload error"""
+    if isinstance(error, KeyError):
+        message = f"Missing field: {error.args[0]}"
+    elif isinstance(error, ValidationError):
+        message = '; '.join(error.messages)
+    else:
+        message = str(error)
+    return Response({'error': message}, status=status.HTTP_400_BAD_REQUEST)
 
 
 # ============================================================================
@@ -33,35 +49,54 @@ from users.models import UserProfile
 def role_list(request):
     """List and create roles"""
     if request.method == 'GET':
-        if not has_permission(request.user, 'read', 'role'):
+        if not request_has_permission(request, 'read', 'role'):
             return Response({'error': 'Permission denied'}, status=status.HTTP_403_FORBIDDEN)
         
-        roles = Role.objects.filter(is_active=True)
+        roles = Role.objects.filter(is_active=True).annotate(
+            permissions_count=Count('role_permissions', filter=Q(role_permissions__is_active=True), distinct=True),
+            users_count=Count('user_roles', filter=Q(user_roles__is_active=True), distinct=True),
+        )
         
         # Filter by department if user has department scope
-        user_permissions = get_user_permissions(request.user)
-        if not user_permissions.get('role', {}).get('read_all', False):
+        if not request_has_permission(request, 'read_all', 'role'):
             user_department = request.user.profile.department
             roles = roles.filter(department=user_department)
         
+        # Rows are read as plain dicts; no Role instances are built for the listing
+        roles = roles.values(
+            'id', 'name', 'codename', 'description', 'role_type', 'department__name',
+            'is_system_role', 'permissions_count', 'users_count', 'created_at',
+        )
+        
         # Pagination
         page = request.GET.get('page', 1)
         paginator = Paginator(roles, 20)
-        roles_page = paginator.get_page(page)
+        role_rows = list(paginator.get_page(page))
+        for row in role_rows:
+            row['department'] = row.pop('department__name')
+        
+        # ?expand=permissions loads the page's active permissions in one extra query
+        if request.GET.get('expand') == 'permissions':
+            permissions_by_role = {row['id']: [] for row in role_rows}
+            role_permissions = RolePermission.objects.filter(
+                role_id__in=permissions_by_role, is_active=True,
+            ).values_list(
+                'role_id', 'permission_id', 'permission__name', 'permission__codename',
+                'permission__permission_type', 'permission__resource_type',
+            )
+            for role_id, permission_id, name, codename, permission_type, resource_type in role_permissions:
+                permissions_by_role[role_id].append({
+                    'id': permission_id,
+                    'name': name,
+                    'codename': codename,
+                    'permission_type': permission_type,
+                    'resource_type': resource_type,
+                })
+            for row in role_rows:
+                row['permissions'] = permissions_by_role[row['id']]
         
         data = {
-            'roles': [{
-                'id': role.id,
-                'name': role.name,
-                'codename': role.codename,
-                'description': role.description,
-                'role_type': role.role_type,
-                'department': role.department.name if role.department else None,
-                'is_system_role': role.is_system_role,
-                'permissions_count': role.role_permissions.filter(is_active=True).count(),
-                'users_count': role.user_roles.filter(is_active=True).count(),
-                'created_at': role.created_at,
-            } for role in roles_page],
+            'roles': role_rows,
             'total_pages': paginator.num_pages,
             'current_page': page,
         }
@@ -69,16 +104,19 @@ def role_list(request):
         return Response(data)
     
     elif request.method == 'POST':
-        if not has_permission(request.user, 'create', 'role'):
+        unscoped, department_scopes = allowed_department_scopes(request.user, 'create', 'role')
+        if not unscoped and not department_scopes:
             return Response({'error': 'Permission denied'}, status=status.HTTP_403_FORBIDDEN)
         
         try:
             with transaction.atomic():
                 data = request.data
                 
-                # Validate department scope
-                if data.get('department_id'):
-                    if not has_permission(request.user, 'create', 'role', department_id=data['department_id']):
+                # Department-scoped grants may only create roles within their departments
+                if not unscoped:
+                    if not data.get('department_id'):
+                        return Response({'error': 'Permission denied'}, status=status.HTTP_403_FORBIDDEN)
+                    if data['department_id'] not in department_scopes:
                         return Response({'error': 'Permission denied for this department'}, status=status.HTTP_403_FORBIDDEN)
                 
                 role = Role.objects.create(
@@ -106,26 +144,24 @@ def role_list(request):
                     'message': 'Role created successfully'
                 }, status=status.HTTP_201_CREATED)
                 
-        except Exception as e:
-            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        except CLIENT_ERRORS as e:
+            return _client_error_response(e)
 
 
 @api_view(['GET', 'PUT', 'DELETE'])
 @permission_classes([IsAuthenticated])
 def role_detail(request, role_id):
     """Get, update, or delete a specific role"""
-    role = get_object_or_404(Role, id=role_id)
+    role = get_object_or_404(Role.objects.select_related('department'), id=role_id)
     
     if request.method == 'GET':
-        if not has_permission(request.user, 'read', 'role'):
+        # One resolution covers both the general and the department check
+        unscoped, _ = allowed_department_scopes(request.user, 'read', 'role')
+        if not unscoped:
             return Response({'error': 'Permission denied'}, status=status.HTTP_403_FORBIDDEN)
         
-        # Check department scope
-        if role.department and not has_permission(request.user, 'read', 'role', department_id=role.department.id):
-            return Response({'error': 'Permission denied for this department'}, status=status.HTTP_403_FORBIDDEN)
-        
         permissions = role.role_permissions.filter(is_active=True).select_related('permission')
-        users = role.user_roles.filter(is_active=True).select_related('user')
+        users = role.user_roles.filter(is_active=True).select_related('user').annotate_is_current()
         
         data = {
             'id': role.id,
@@ -144,7 +180,7 @@ def role_detail(request, role_id):
                 'codename': rp.permission.codename,
                 'permission_type': rp.permission.permission_type,
                 'resource_type': rp.permission.resource_type,
-                'conditions': rp.conditions,
+                'conditions': rp.parsed_conditions,
             } for rp in permissions],
             'users': [{
                 'id': ur.user.id,
@@ -152,7 +188,7 @@ def role_detail(request, role_id):
                 'email': ur.user.email,
                 'start_date': ur.start_date,
                 'end_date': ur.end_date,
-                'is_current': ur.is_current,
+                'is_current': ur.is_current_db,
             } for ur in users],
             'created_at': role.created_at,
             'updated_at': role.updated_at,
@@ -161,7 +197,7 @@ def role_detail(request, role_id):
         return Response(data)
     
     elif request.method == 'PUT':
-        if not has_permission(request.user, 'update', 'role'):
+        if not request_has_permission(request, 'update', 'role'):
             return Response({'error': 'Permission denied'}, status=status.HTTP_403_FORBIDDEN)
         
         try:
@@ -195,11 +231,11 @@ def role_detail(request, role_id):
                 
                 return Response({'message': 'Role updated successfully'})
                 
-        except Exception as e:
-            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        except CLIENT_ERRORS as e:
+            return _client_error_response(e)
     
     elif request.method == 'DELETE':
-        if not has_permission(request.user, 'delete', 'role'):
+        if not request_has_permission(request, 'delete', 'role'):
             return Response({'error': 'Permission denied'}, status=status.HTTP_403_FORBIDDEN)
         
         # Check if role is in use
@@ -207,7 +243,7 @@ def role_detail(request, role_id):
             return Response({'error': 'Cannot delete role that is assigned to users'}, status=status.HTTP_400_BAD_REQUEST)
         
         role.is_active = False
-        role.save()
+        role.save(update_fields=['is_active', 'updated_at'])
         
         return Response({'message': 'Role deleted successfully'})
 
@@ -221,10 +257,12 @@ def role_detail(request, role_id):
 def permission_list(request):
     """List and create permissions"""
     if request.method == 'GET':
-        if not has_permission(request.user, 'read', 'permission'):
+        if not request_has_permission(request, 'read', 'permission'):
             return Response({'error': 'Permission denied'}, status=status.HTTP_403_FORBIDDEN)
         
-        permissions = Permission.objects.filter(is_active=True)
+        permissions = Permission.objects.filter(is_active=True).select_related('department_scope').annotate(
+            roles_count=Count('role_permissions', filter=Q(role_permissions__is_active=True)),
+        )
         
         # Filter by resource type
         resource_type = request.GET.get('resource_type')
@@ -246,7 +284,7 @@ def permission_list(request):
                 'resource_type': perm.resource_type,
                 'department_scope': perm.department_scope.name if perm.department_scope else None,
                 'is_system_permission': perm.is_system_permission,
-                'roles_count': perm.role_permissions.filter(is_active=True).count(),
+                'roles_count': perm.roles_count,
                 'created_at': perm.created_at,
             } for perm in permissions]
         }
@@ -254,7 +292,7 @@ def permission_list(request):
         return Response(data)
     
     elif request.method == 'POST':
-        if not has_permission(request.user, 'create', 'permission'):
+        if not request_has_permission(request, 'create', 'permission'):
             return Response({'error': 'Permission denied'}, status=status.HTTP_403_FORBIDDEN)
         
         try:
@@ -278,35 +316,45 @@ def permission_list(request):
                     'message': 'Permission created successfully'
                 }, status=status.HTTP_201_CREATED)
                 
-        except Exception as e:
-            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        except CLIENT_ERRORS as e:
+            return _client_error_response(e)
+
+
+# Static model choices, built once at import time
+PERMISSION_CHOICES = {
+    'permission_types': list(Permission.PERMISSION_TYPE_CHOICES),
+    'resource_types': list(Permission.RESOURCE_TYPE_CHOICES),
+    'role_types': list(Role.ROLE_TYPE_CHOICES),
+}
 
 
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
 def permission_choices(request):
     """Get available permission and resource type choices"""
-    data = {
-        'permission_types': Permission.PERMISSION_TYPE_CHOICES,
-        'resource_types': Permission.RESOURCE_TYPE_CHOICES,
-        'role_types': Role.ROLE_TYPE_CHOICES,
-    }
-    return Response(data)
+    response = Response(PERMISSION_CHOICES)
+    # The choices only change on deploy; let clients reuse them
+    response['Cache-Control'] = 'private, max-age=3600'
+    return response
 
 
 # ============================================================================
 # USER ROLE ASSIGNMENT APIs
 # ============================================================================
 
+USER_ROLE_PAGE_SIZE = 50
+USER_ROLE_MAX_PAGE_SIZE = 200
+
+
 @api_view(['GET', 'POST'])
 @permission_classes([IsAuthenticated])
 def user_role_list(request):
     """List and create user role assignments"""
     if request.method == 'GET':
-        if not has_permission(request.user, 'read', 'user'):
+        if not request_has_permission(request, 'read', 'user'):
             return Response({'error': 'Permission denied'}, status=status.HTTP_403_FORBIDDEN)
         
-        user_roles = UserRole.objects.filter(is_active=True).select_related('user', 'role', 'department')
+        user_roles = UserRole.objects.filter(is_active=True).annotate_is_current()
         
         # Filter by user
         user_id = request.GET.get('user_id')
@@ -323,35 +371,54 @@ def user_role_list(request):
         if department_id:
             user_roles = user_roles.filter(department_id=department_id)
         
+        # Pagination; page_size is capped so a single request cannot pull the whole table
+        page = request.GET.get('page', 1)
+        try:
+            page_size = min(max(int(request.GET.get('page_size', USER_ROLE_PAGE_SIZE)), 1), USER_ROLE_MAX_PAGE_SIZE)
+        except ValueError:
+            page_size = USER_ROLE_PAGE_SIZE
+        # Rows are read as plain dicts joined in SQL; no model instances are built
+        user_roles = user_roles.order_by('-id').values(
+            'id', 'user_id', 'user__username', 'user__email',
+            'role_id', 'role__name', 'role__codename',
+            'department_id', 'department__name',
+            'start_date', 'end_date', 'is_current_db', 'assigned_by__username', 'reason',
+        )
+        paginator = Paginator(user_roles, page_size)
+        user_roles_page = paginator.get_page(page)
+        
         data = {
             'user_roles': [{
-                'id': ur.id,
+                'id': ur['id'],
                 'user': {
-                    'id': ur.user.id,
-                    'username': ur.user.username,
-                    'email': ur.user.email,
+                    'id': ur['user_id'],
+                    'username': ur['user__username'],
+                    'email': ur['user__email'],
                 },
                 'role': {
-                    'id': ur.role.id,
-                    'name': ur.role.name,
-                    'codename': ur.role.codename,
+                    'id': ur['role_id'],
+                    'name': ur['role__name'],
+                    'codename': ur['role__codename'],
                 },
                 'department': {
-                    'id': ur.department.id,
-                    'name': ur.department.name,
-                } if ur.department else None,
-                'start_date': ur.start_date,
-                'end_date': ur.end_date,
-                'is_current': ur.is_current,
-                'assigned_by': ur.assigned_by.username if ur.assigned_by else None,
-                'reason': ur.reason,
-            } for ur in user_roles]
+                    'id': ur['department_id'],
+                    'name': ur['department__name'],
+                } if ur['department_id'] else None,
+                'start_date': ur['start_date'],
+                'end_date': ur['end_date'],
+                'is_current': ur['is_current_db'],
+                'assigned_by': ur['assigned_by__username'],
+                'reason': ur['reason'],
+            } for ur in user_roles_page],
+            'total_pages': paginator.num_pages,
+            'total_count': paginator.count,
+            'current_page': user_roles_page.number,
         }
         
         return Response(data)
     
     elif request.method == 'POST':
-        if not has_permission(request.user, 'assign', 'user'):
+        if not request_has_permission(request, 'assign', 'user'):
             return Response({'error': 'Permission denied'}, status=status.HTTP_403_FORBIDDEN)
         
         try:
@@ -364,47 +431,46 @@ def user_role_list(request):
                 # Validate role exists
                 role = get_object_or_404(Role, id=data['role_id'])
                 
-                # Check if assignment already exists
-                existing = UserRole.objects.filter(
+                # Look up and create in one step; the uniq_active_userrole constraint backs it
+                user_role, created = UserRole.objects.get_or_create(
                     user=user,
                     role=role,
                     department_id=data.get('department_id'),
-                    is_active=True
-                ).first()
+                    is_active=True,
+                    defaults={
+                        'start_date': data.get('start_date') or timezone.now(),
+                        'end_date': data.get('end_date'),
+                        'conditions': data.get('conditions', {}),
+                        'assigned_by': request.user,
+                        'reason': data.get('reason', ''),
+                    },
+                )
                 
-                if existing:
+                if not created:
                     return Response({'error': 'User already has this role assignment'}, status=status.HTTP_400_BAD_REQUEST)
                 
-                user_role = UserRole.objects.create(
-                    user=user,
-                    role=role,
-                    department_id=data.get('department_id'),
-                    start_date=data.get('start_date', timezone.now()),
-                    end_date=data.get('end_date'),
-                    conditions=data.get('conditions', {}),
-                    assigned_by=request.user,
-                    reason=data.get('reason', ''),
-                )
+                # Rebuild the assignee's permissions in a worker once committed, off this request
+                transaction.on_commit(lambda: warm_user_permission_cache.delay(user.id))
                 
                 return Response({
                     'id': user_role.id,
                     'message': 'Role assigned successfully'
                 }, status=status.HTTP_201_CREATED)
                 
-        except Exception as e:
-            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        except CLIENT_ERRORS as e:
+            return _client_error_response(e)
 
 
 @api_view(['DELETE'])
 @permission_classes([IsAuthenticated])
 def user_role_detail(request, user_role_id):
     """Remove a user role assignment"""
-    if not has_permission(request.user, 'assign', 'user'):
+    if not request_has_permission(request, 'assign', 'user'):
         return Response({'error': 'Permission denied'}, status=status.HTTP_403_FORBIDDEN)
     
     user_role = get_object_or_404(UserRole, id=user_role_id)
     user_role.is_active = False
-    user_role.save()
+    user_role.save(update_fields=['is_active', 'updated_at'])
     
     return Response({'message': 'Role assignment removed successfully'})
 
@@ -417,7 +483,7 @@ def user_role_detail(request, user_role_id):
 @permission_classes([IsAuthenticated])
 def bulk_user_registration(request):
     """Bulk register users from CSV or JSON data"""
-    if not has_permission(request.user, 'create', 'user'):
+    if not request_has_permission(request, 'create', 'user'):
         return Response({'error': 'Permission denied'}, status=status.HTTP_403_FORBIDDEN)
     
     try:
@@ -428,107 +494,72 @@ def bulk_user_registration(request):
             if not users_data:
                 return Response({'error': 'No users data provided'}, status=status.HTTP_400_BAD_REQUEST)
             
-            created_users = []
-            errors = []
-            
-            for user_data in users_data:
-                try:
-                    # Create user
-                    user = User.objects.create_user(
-                        username=user_data['username'],
-                        email=user_data['email'],
-                        password=user_data.get('password', 'defaultpassword123'),
-                        first_name=user_data.get('first_name', ''),
-                        last_name=user_data.get('last_name', ''),
-                    )
-                    
-                    # Create user profile
-                    profile = UserProfile.objects.create(
-                        user=user,
-                        department_id=user_data.get('department_id'),
-                        position_id=user_data.get('position_id'),
-                        employee_id=user_data.get('employee_id', ''),
-                        phone_number=user_data.get('phone_number', ''),
-                        date_of_birth=user_data.get('date_of_birth'),
-                        hire_date=user_data.get('hire_date'),
-                        supervisor_id=user_data.get('supervisor_id'),
-                    )
-                    
-                    # Assign roles if provided
-                    if user_data.get('roles'):
-                        for role_data in user_data['roles']:
-                            UserRole.objects.create(
-                                user=user,
-                                role_id=role_data['role_id'],
-                                department_id=role_data.get('department_id'),
-                                start_date=role_data.get('start_date', timezone.now()),
-                                end_date=role_data.get('end_date'),
-                                assigned_by=request.user,
-                                reason=role_data.get('reason', 'Bulk registration'),
-                            )
-                    
-                    created_users.append({
-                        'id': user.id,
-                        'username': user.username,
-                        'email': user.email,
-                        'employee_id': profile.employee_id,
-                    })
-                    
-                except Exception as e:
-                    errors.append({
-                        'username': user_data.get('username', 'Unknown'),
-                        'error': str(e)
-                    })
-            
-            return Response({
-                'created_users': created_users,
-                'errors': errors,
-                'total_created': len(created_users),
-                'total_errors': len(errors),
-                'message': f'Successfully created {len(created_users)} users'
-            }, status=status.HTTP_201_CREATED)
+            created_users, errors = register_users(users_data, request.user, **_audit_request_meta(request))
+            return _bulk_registration_response(created_users, errors)
             
-    except Exception as e:
-        return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+    except CLIENT_ERRORS as e:
+        return _client_error_response(e)
+
+
+def _bulk_registration_response(created_users, errors):
+    """Response for a bulk registration processed within the request"""
+    return Response({
+        'created_users': created_users,
+        'errors': errors,
+        'total_created': len(created_users),
+        'total_errors': len(errors),
+        'message': f'Successfully created {len(created_users)} users'
+    }, status=status.HTTP_201_CREATED)
+
+
+def _audit_request_meta(request):
+    """Client address and agent recorded on audit rows written for a request"""
+    return {
+        'ip_address': request.META.get('REMOTE_ADDR'),
+        'user_agent': request.META.get('HTTP_USER_AGENT', ''),
+    }
 
 
 @api_view(['POST'])
 @permission_classes([IsAuthenticated])
 def bulk_user_registration_csv(request):
-    """Bulk register users from CSV file"""
-    if not has_permission(request.user, 'create', 'user'):
+    """
+    Queue a CSV file for bulk registration.
+    
+    The upload is stored and processed by a Celery worker; the response carries
+    a job id whose progress and result are read from bulk_registration_job.
+    """
+    if not request_has_permission(request, 'create', 'user'):
         return Response({'error': 'Permission denied'}, status=status.HTTP_403_FORBIDDEN)
     
-    try:
-        csv_file = request.FILES.get('csv_file')
-        if not csv_file:
-            return Response({'error': 'No CSV file provided'}, status=status.HTTP_400_BAD_REQUEST)
-        
-        # Read CSV file
-        csv_data = csv_file.read().decode('utf-8')
-        csv_reader = csv.DictReader(StringIO(csv_data))
-        
-        users_data = []
-        for row in csv_reader:
-            users_data.append({
-                'username': row['username'],
-                'email': row['email'],
-                'first_name': row.get('first_name', ''),
-                'last_name': row.get('last_name', ''),
-                'password': row.get('password', 'defaultpassword123'),
-                'department_id': row.get('department_id'),
-                'position_id': row.get('position_id'),
-                'employee_id': row.get('employee_id', ''),
-                'phone_number': row.get('phone_number', ''),
-                'supervisor_id': row.get('supervisor_id'),
-            })
-        
-        # Use the existing bulk registration logic
-        request.data = {'users': users_data}
-        return bulk_user_registration(request)
-        
-    except Exception as e:
-        return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+    csv_file = request.FILES.get('csv_file')
+    if not csv_file:
+        return Response({'error': 'No CSV file provided'}, status=status.HTTP_400_BAD_REQUEST)
+    
+    job_id = uuid.uuid4().hex
+    upload_name = default_storage.save(f"bulk_uploads/{job_id}.csv", csv_file)
+    set_bulk_registration_job(job_id, status='pending', processed=0, total_created=0, total_errors=0)
+    bulk_register_users_csv.delay(job_id, upload_name, request.user.id, **_audit_request_meta(request))
+    
+    return Response({
+        'job_id': job_id,
+        'status': 'pending',
+        'message': 'Bulk registration queued'
+    }, status=status.HTTP_202_ACCEPTED)
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def bulk_registration_job(request, job_id):
+    """Get the progress, and once finished the result, of a queued CSV registration"""
+    if not request_has_permission(request, 'create', 'user'):
+        return Response({'error': 'Permission denied'}, status=status.HTTP_403_FORBIDDEN)
+    
+    job = get_bulk_registration_job(job_id)
+    if job is None:
+        return Response({'error': 'Job not found'}, status=status.HTTP_404_NOT_FOUND)
+    
+    return Response(job)
 
 
 # ============================================================================
@@ -540,25 +571,17 @@ def bulk_user_registration_csv(request):
 def system_config_list(request):
     """List and create system configurations"""
     if request.method == 'GET':
-        if not has_permission(request.user, 'read', 'system_config'):
+        if not request_has_permission(request, 'read', 'system_config'):
             return Response({'error': 'Permission denied'}, status=status.HTTP_403_FORBIDDEN)
         
-        configs = SystemConfiguration.objects.filter(is_active=True)
-        
         data = {
-            'configurations': [{
-                'key': config.key,
-                'value': config.value,
-                'description': config.description,
-                'created_at': config.created_at,
-                'updated_at': config.updated_at,
-            } for config in configs]
+            'configurations': SystemConfiguration.get_active_list()
         }
         
         return Response(data)
     
     elif request.method == 'POST':
-        if not has_permission(request.user, 'create', 'system_config'):
+        if not request_has_permission(request, 'create', 'system_config'):
             return Response({'error': 'Permission denied'}, status=status.HTTP_403_FORBIDDEN)
         
         try:
@@ -575,8 +598,8 @@ def system_config_list(request):
                 'message': 'Configuration created successfully'
             }, status=status.HTTP_201_CREATED)
             
-        except Exception as e:
-            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        except CLIENT_ERRORS as e:
+            return _client_error_response(e)
 
 
 @api_view(['GET', 'PUT'])
@@ -584,7 +607,7 @@ def system_config_list(request):
 def system_config_detail(request, key):
     """Get or update a specific system configuration"""
     if request.method == 'GET':
-        if not has_permission(request.user, 'read', 'system_config'):
+        if not request_has_permission(request, 'read', 'system_config'):
             return Response({'error': 'Permission denied'}, status=status.HTTP_403_FORBIDDEN)
         
         value = SystemConfiguration.get_value(key)
@@ -594,7 +617,7 @@ def system_config_detail(request, key):
         return Response({'key': key, 'value': value})
     
     elif request.method == 'PUT':
-        if not has_permission(request.user, 'update', 'system_config'):
+        if not request_has_permission(request, 'update', 'system_config'):
             return Response({'error': 'Permission denied'}, status=status.HTTP_403_FORBIDDEN)
         
         try:
@@ -611,5 +634,5 @@ def system_config_detail(request, key):
                 'message': 'Configuration updated successfully'
             })
             
-        except Exception as e:
-            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        except CLIENT_ERRORS as e:
+            return _client_error_response(e)
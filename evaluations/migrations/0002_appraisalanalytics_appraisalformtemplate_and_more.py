@@ -239,10 +239,6 @@ class Migration(migrations.Migration):
             model_name='evaluationform',
             name='total_score',
         ),
-        migrations.AlterUniqueTogether(
-            name='evaluationquestion',
-            unique_together={('section', 'order', 'version')},
-        ),
         migrations.RemoveField(
             model_name='evaluationrecommendation',
             name='justification',
@@ -741,4 +737,8 @@ class Migration(migrations.Migration):
             name='peerfeedback',
             unique_together={('evaluation_form', 'feedback_provider', 'feedback_recipient')},
         ),
+        migrations.AlterUniqueTogether(
+            name='evaluationquestion',
+            unique_together={('section', 'order', 'version')},
+        ),
     ]
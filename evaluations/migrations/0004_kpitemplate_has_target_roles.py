@@ -0,0 +1,28 @@
+# Generated by Django 5.2.18 on 2026-10-15 23:15
+
+from django.db import migrations, models
+
+
+def backfill_has_target_roles(apps, schema_editor):
+    KPITemplate = apps.get_model('evaluations', 'KPITemplate')
+    KPITemplate.objects.update(
+        has_target_roles=models.Exists(
+            KPITemplate.target_roles.through.objects.filter(kpitemplate_id=models.OuterRef('pk'))
+        )
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('evaluations', '0003_alter_evaluationperiod_submission_deadline'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='kpitemplate',
+            name='has_target_roles',
+            field=models.BooleanField(db_index=True, default=False),
+        ),
+        migrations.RunPython(backfill_has_target_roles, migrations.RunPython.noop),
+    ]
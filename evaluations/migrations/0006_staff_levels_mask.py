@@ -0,0 +1,41 @@
+# Generated by Django 5.2.18 on 2026-10-15 23:19
+
+from django.db import migrations, models
+
+
+STAFF_LEVEL_BITS = {
+    'entry': 1, 'junior': 2, 'mid': 4, 'senior': 8,
+    'lead': 16, 'manager': 32, 'director': 64, 'executive': 128,
+}
+
+
+def backfill_staff_level_masks(apps, schema_editor):
+    for model_name in ('KPITemplate', 'EvaluationQuestion'):
+        model = apps.get_model('evaluations', model_name)
+        rows = model.objects.exclude(target_staff_levels=[]).only('pk', 'target_staff_levels')
+        for row in rows.iterator():
+            row.target_staff_levels_mask = 0
+            for level in row.target_staff_levels or ():
+                row.target_staff_levels_mask |= STAFF_LEVEL_BITS.get(level, 0)
+            row.save(update_fields=['target_staff_levels_mask'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('evaluations', '0004_kpitemplate_has_target_roles'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='evaluationquestion',
+            name='target_staff_levels_mask',
+            field=models.PositiveSmallIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='kpitemplate',
+            name='target_staff_levels_mask',
+            field=models.PositiveSmallIntegerField(default=0),
+        ),
+        migrations.RunPython(backfill_staff_level_masks, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 5.2.18 on 2026-10-15 23:20
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0011_systemconfiguration_value_varchar'),
+        ('evaluations', '0006_staff_levels_mask'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='evaluationform',
+            name='evaluations_user_id_e41f43_idx',
+        ),
+        migrations.AddIndex(
+            model_name='kpitemplate',
+            index=models.Index(fields=['is_active', 'visibility'], name='evaluations_is_acti_64586a_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='kpitemplate',
+            index=models.Index(fields=['kpi_type', 'is_active'], name='evaluations_kpi_typ_561400_idx'),
+        ),
+    ]
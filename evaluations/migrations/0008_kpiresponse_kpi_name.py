@@ -0,0 +1,31 @@
+# Generated by Django 5.2.18 on 2026-10-15 23:20
+
+from django.db import migrations, models
+
+
+def backfill_kpi_names(apps, schema_editor):
+    KPITemplate = apps.get_model('evaluations', 'KPITemplate')
+    KPIResponse = apps.get_model('evaluations', 'KPIResponse')
+    KPIResponse.objects.update(
+        kpi_name=models.Subquery(KPITemplate.objects.filter(pk=models.OuterRef('kpi_id')).values('name')[:1])
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('evaluations', '0007_kpitemplate_filter_indexes'),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='kpiresponse',
+            options={'ordering': ['kpi_name']},
+        ),
+        migrations.AddField(
+            model_name='kpiresponse',
+            name='kpi_name',
+            field=models.CharField(db_index=True, default='', max_length=200),
+        ),
+        migrations.RunPython(backfill_kpi_names, migrations.RunPython.noop),
+    ]
@@ -1,11 +1,156 @@
+import ast
+from functools import lru_cache
+
 from django.db import models
+from django.db.models.functions import Coalesce
+from django.db.models.lookups import GreaterThan
 from django.contrib.auth.models import User
 from django.core.cache import cache
 from django.utils import timezone
-from core.models import Department
+from core.models import Department, Role
 from users.models import UserProfile
 
 
+VISIBILITY_CACHE_TIMEOUT = 300
+
+
+def _copy_targeting(model, sources, clones, relations):
+    """Copy M2M targeting rows from each source onto its clone, one read and one insert per relation"""
+    clone_ids = {source.pk: clone.pk for source, clone in zip(sources, clones)}
+    for relation in relations:
+        field = model._meta.get_field(relation)
+        through = field.remote_field.through
+        source_column, target_column = field.m2m_column_name(), field.m2m_reverse_name()
+        rows = through.objects.filter(**{f"{source_column}__in": list(clone_ids)}).values_list(
+            source_column, target_column
+        )
+        through.objects.bulk_create(
+            [through(**{source_column: clone_ids[source_id], target_column: target_id}) for source_id, target_id in rows],
+            ignore_conflicts=True,
+        )
+
+
+def _visibility_cache_key(obj, user):
+    """Cache key for a visibility check; a save or targeting change moves updated_at and orphans it"""
+    return f"{obj._meta.model_name}_vis:{obj.pk}:{int(obj.updated_at.timestamp() * 1000000)}:{user.pk}"
+
+
+def _cached_visibility(obj, user, compute):
+    cache_key = _visibility_cache_key(obj, user)
+    visible = cache.get(cache_key)
+    if visible is None:
+        visible = bool(compute(user))
+        cache.set(cache_key, visible, VISIBILITY_CACHE_TIMEOUT)
+    return visible
+
+
+# One bit per staff level, mirrored from target_staff_levels into target_staff_levels_mask.
+# Covers every level in EvaluationQuestion.STAFF_LEVEL_CHOICES and Position.STAFF_LEVEL_CHOICES,
+# so staff level targeting is always resolved on the mask.
+STAFF_LEVEL_BITS = {
+    'entry': 1, 'junior': 2, 'mid': 4, 'senior': 8,
+    'lead': 16, 'manager': 32, 'director': 64, 'executive': 128,
+}
+
+
+def staff_level_mask(levels):
+    """Bitmask for a list of staff levels; levels outside STAFF_LEVEL_BITS are left out"""
+    mask = 0
+    for level in levels or ():
+        mask |= STAFF_LEVEL_BITS.get(level, 0)
+    return mask
+
+
+def _targets_staff_level(obj, staff_level):
+    """Whether obj targets staff_level, tested on the mask; unknown levels never match"""
+    return bool(obj.target_staff_levels_mask & STAFF_LEVEL_BITS.get(staff_level, 0))
+
+
+def _save_staff_level_mask(obj, kwargs):
+    """Recompute target_staff_levels_mask in save(), extending update_fields to match"""
+    update_fields = kwargs.get('update_fields')
+    if update_fields is None or 'target_staff_levels' in update_fields:
+        obj.target_staff_levels_mask = staff_level_mask(obj.target_staff_levels)
+        if update_fields is not None:
+            kwargs['update_fields'] = {*update_fields, 'target_staff_levels_mask'}
+
+
+def _target_ids(obj, relation):
+    """
+    Primary keys of a targeting M2M, read from the prefetch cache when
+    with_targeting() loaded it, and skipped when with_targeting_counts() saw none
+    """
+    if getattr(obj, f"{relation}_count", None) == 0:
+        return frozenset()
+    manager = getattr(obj, relation)
+    if relation in getattr(obj, '_prefetched_objects_cache', {}):
+        return frozenset(target.pk for target in manager.all())
+    return frozenset(manager.values_list('id', flat=True))
+
+
+# Custom scoring formulas are arithmetic over these names only
+FORMULA_VARIABLES = ('actual', 'target', 'threshold')
+FORMULA_FUNCTIONS = {'min': min, 'max': max, 'abs': abs}
+_FORMULA_NODES = (
+    ast.Expression, ast.BinOp, ast.UnaryOp, ast.Constant, ast.Name, ast.Load, ast.Call,
+    ast.Add, ast.Sub, ast.Mult, ast.Div, ast.FloorDiv, ast.Mod, ast.Pow, ast.USub, ast.UAdd,
+)
+_FORMULA_MAX_EXPONENT = 10
+
+
+def _validate_formula(tree):
+    """Reject anything in a parsed formula beyond arithmetic, the bound names and min/max/abs"""
+    for node in ast.walk(tree):
+        if not isinstance(node, _FORMULA_NODES):
+            raise ValueError(f"Unsupported formula element: {type(node).__name__}")
+        if isinstance(node, ast.Constant) and (
+            isinstance(node.value, bool) or not isinstance(node.value, (int, float))
+        ):
+            raise ValueError("Formula constants must be numbers")
+        if isinstance(node, ast.Name) and node.id not in FORMULA_VARIABLES + tuple(FORMULA_FUNCTIONS):
+            raise ValueError(f"Unknown formula name: {node.id}")
+        if isinstance(node, ast.Call) and (
+            not isinstance(node.func, ast.Name) or node.func.id not in FORMULA_FUNCTIONS or node.keywords
+        ):
+            raise ValueError("Only min(), max() and abs() may be called in a formula")
+        if isinstance(node, ast.BinOp) and isinstance(node.op, ast.Pow) and not (
+            isinstance(node.right, ast.Constant) and abs(node.right.value) <= _FORMULA_MAX_EXPONENT
+        ):
+            raise ValueError("Formula exponents must be small numeric constants")
+
+
+@lru_cache(maxsize=512)
+def _compile_formula(formula):
+    """Parse, validate and compile a scoring formula once per distinct string"""
+    tree = ast.parse(formula, mode='eval')
+    _validate_formula(tree)
+    return compile(tree, '<kpi formula>', 'eval')
+
+
+@lru_cache(maxsize=4096)
+def _score(method, actual, target, threshold):
+    """Score for the built-in scoring methods; a pure function of its arguments"""
+    if method == 'linear':
+        if target > 0:
+            return min((actual / target) * 100, 100)
+        return 0
+
+    elif method == 'threshold':
+        if actual >= threshold:
+            return 100
+        elif actual > 0:
+            return (actual / threshold) * 100
+        return 0
+
+    elif method == 'exponential':
+        if target > 0:
+            ratio = actual / target
+            return min((ratio ** 2) * 100, 100)
+        return 0
+
+    return 0
+
+
 def get_default_submission_deadline():
     """Return current datetime as default for submission_deadline field"""
     return timezone.now()
@@ -30,6 +175,92 @@ class EvaluationPeriod(models.Model):
         return f"{self.name} ({self.start_date} - {self.end_date})"
 
 
+class TargetingQuerySet(models.QuerySet):
+    """Shared helpers for models targeted through M2M relations"""
+    targeting_relations = ()
+
+    def with_targeting_counts(self):
+        """
+        Annotate <relation>_count for each targeting relation, so visibility
+        checks skip the relations a row does not use without a query
+        """
+        annotations = {}
+        for relation in self.targeting_relations:
+            field = self.model._meta.get_field(relation)
+            column = field.m2m_column_name()
+            rows = field.remote_field.through.objects.filter(**{column: models.OuterRef('pk')})
+            annotations[f"{relation}_count"] = Coalesce(
+                models.Subquery(
+                    rows.order_by().values(column).annotate(count=models.Count('pk')).values('count'),
+                    output_field=models.IntegerField(),
+                ),
+                0,
+            )
+        return self.annotate(**annotations)
+
+
+class KPITemplateQuerySet(TargetingQuerySet):
+    targeting_relations = ('target_roles', 'target_departments', 'target_positions')
+
+    def with_targeting(self):
+        """Join the creator rows and prefetch the targeting relations read by list views"""
+        return self.select_related('created_by', 'created_by_role', 'approval_workflow').prefetch_related(
+            models.Prefetch('target_roles', queryset=Role.objects.only('id', 'codename', 'role_level')),
+            'target_departments',
+            'target_positions',
+        )
+
+    def visible_to(self, user, department_id=None):
+        """
+        KPIs whose visibility settings admit user, resolved in SQL (the
+        queryset counterpart of KPITemplate.is_visible_for_user)
+        """
+        profile = user.profile
+        department_id = department_id or profile.department_id
+        position_id = profile.position_id
+        staff_level = profile.position.staff_level if position_id else None
+        roles = list(
+            user.core_user_roles.filter(is_active=True).values_list('role_id', 'role__role_level', 'role__codename')
+        )
+
+        role_match = self._targets_include('target_roles', [role_id for role_id, _, _ in roles])
+        department_match = self._targets_include('target_departments', [department_id] if department_id else [])
+        position_match = self._targets_include('target_positions', [position_id] if position_id else [])
+        level_match = self._staff_level_q(staff_level) if position_id else models.Q(pk__in=[])
+
+        visible = models.Q(visibility='all')
+        if any(role_level in ['manager', 'director', 'executive'] for _, role_level, _ in roles):
+            visible |= models.Q(visibility='management')
+        if any(codename == 'hr' for _, _, codename in roles):
+            visible |= models.Q(visibility='hr')
+        visible |= models.Q(visibility='department') & department_match
+        visible |= models.Q(visibility='role') & role_match
+        visible |= models.Q(visibility='level') & level_match
+        visible |= (
+            models.Q(visibility='custom')
+            & (models.Q(has_target_roles=False) | role_match)
+            & (models.Q(target_staff_levels=[]) | level_match if position_id else models.Q())
+            & (~self._targets_include('target_departments') | department_match)
+            & (~self._targets_include('target_positions') | position_match)
+        )
+        return self.filter(visible)
+
+    def _targets_include(self, relation, pks=None):
+        """EXISTS over a targeting through table; any row when pks is None, else one matching pks"""
+        field = self.model._meta.get_field(relation)
+        rows = field.remote_field.through.objects.filter(**{field.m2m_column_name(): models.OuterRef('pk')})
+        if pks is not None:
+            rows = rows.filter(**{f"{field.m2m_reverse_name()}__in": pks})
+        return models.Q(models.Exists(rows))
+
+    def _staff_level_q(self, staff_level):
+        """Rows whose target_staff_levels include staff_level, matched on the mask"""
+        bit = STAFF_LEVEL_BITS.get(staff_level)
+        if bit is None:
+            return models.Q(pk__in=[])
+        return models.Q(GreaterThan(models.F('target_staff_levels_mask').bitand(bit), 0))
+
+
 class KPITemplate(models.Model):
     """Dynamic KPI templates with role-based creation permissions"""
     KPI_TYPE_CHOICES = [
@@ -63,7 +294,9 @@ class KPITemplate(models.Model):
     
     # Role-based targeting
     target_roles = models.ManyToManyField('core.Role', blank=True, related_name='kpi_templates')
+    has_target_roles = models.BooleanField(default=False, db_index=True)  # Denormalized from target_roles, kept by signals
     target_staff_levels = models.JSONField(default=list, blank=True)
+    target_staff_levels_mask = models.PositiveSmallIntegerField(default=0)  # Denormalized from target_staff_levels
     target_departments = models.ManyToManyField('core.Department', blank=True, related_name='kpi_templates')
     target_positions = models.ManyToManyField('core.Position', blank=True, related_name='kpi_templates')
     
@@ -114,17 +347,27 @@ class KPITemplate(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = KPITemplateQuerySet.as_manager()
+
     class Meta:
         ordering = ['name']
         unique_together = ['name', 'version']
+        indexes = [
+            models.Index(fields=['is_active', 'visibility']),
+            models.Index(fields=['kpi_type', 'is_active']),
+        ]
 
     def __str__(self):
         return f"{self.name} (v{self.version})"
 
+    def save(self, *args, **kwargs):
+        _save_staff_level_mask(self, kwargs)
+        super().save(*args, **kwargs)
+
     @property
     def is_role_specific(self):
         """Check if this KPI is targeted to specific roles"""
-        return self.visibility == 'role' and self.target_roles.exists()
+        return self.visibility == 'role' and self.has_target_roles
 
     @property
     def is_level_specific(self):
@@ -132,42 +375,60 @@ class KPITemplate(models.Model):
         return self.visibility == 'level' and bool(self.target_staff_levels)
 
     def is_visible_for_user(self, user):
-        """Check if this KPI should be visible for a specific user"""
-        user_roles = user.core_user_roles.filter(is_active=True)
-        user_department = getattr(user.profile, 'department', None)
-        user_position = getattr(user.profile, 'position', None)
-        
-        # Check visibility settings
+        """Check if this KPI should be visible for a specific user (cached briefly per user)"""
+        return _cached_visibility(self, user, self._compute_visibility)
+
+    def _compute_visibility(self, user):
+        if self.visibility == 'all':
+            return True
+
+        profile = user.profile
+        roles = list(
+            user.core_user_roles.filter(is_active=True).values_list('role_id', 'role__role_level', 'role__codename')
+        )
+        staff_level = None
+        if profile.position_id and self.visibility in ('level', 'custom'):
+            staff_level = profile.position.staff_level
+        return self._visible_for(
+            roles, profile.department_id, profile.position_id, staff_level,
+            lambda relation: _target_ids(self, relation),
+        )
+
+    def _visible_for(self, roles, department_id, position_id, staff_level, target_ids):
+        """
+        Visibility rules over plain values. roles holds (role_id, role_level,
+        codename) tuples; target_ids(relation) returns a targeting M2M's pks.
+        """
+        role_ids = {role_id for role_id, _, _ in roles}
+
         if self.visibility == 'all':
             return True
         elif self.visibility == 'management':
-            return any(ur.role.role_level in ['manager', 'director', 'executive'] for ur in user_roles)
+            return any(role_level in ['manager', 'director', 'executive'] for _, role_level, _ in roles)
         elif self.visibility == 'hr':
-            return any(ur.role.codename == 'hr' for ur in user_roles)
+            return any(codename == 'hr' for _, _, codename in roles)
         elif self.visibility == 'department':
-            return user_department and user_department in self.target_departments.all()
+            return bool(department_id) and department_id in target_ids('target_departments')
         elif self.visibility == 'role':
-            return any(ur.role in self.target_roles.all() for ur in user_roles)
+            return not role_ids.isdisjoint(target_ids('target_roles'))
         elif self.visibility == 'level':
-            if user_position:
-                return user_position.staff_level in self.target_staff_levels
-            return False
+            return bool(position_id) and _targets_staff_level(self, staff_level)
         elif self.visibility == 'custom':
             # Check all targeting criteria
-            if self.target_roles.exists():
-                if not any(ur.role in self.target_roles.all() for ur in user_roles):
-                    return False
-            if self.target_staff_levels and user_position:
-                if user_position.staff_level not in self.target_staff_levels:
-                    return False
-            if self.target_departments.exists():
-                if not user_department or user_department not in self.target_departments.all():
-                    return False
-            if self.target_positions.exists():
-                if not user_position or user_position not in self.target_positions.all():
+            target_roles = target_ids('target_roles')
+            if target_roles and role_ids.isdisjoint(target_roles):
+                return False
+            if self.target_staff_levels and position_id:
+                if not _targets_staff_level(self, staff_level):
                     return False
+            target_departments = target_ids('target_departments')
+            if target_departments and department_id not in target_departments:
+                return False
+            target_positions = target_ids('target_positions')
+            if target_positions and position_id not in target_positions:
+                return False
             return True
-        
+
         return False
 
     def can_be_created_by_user(self, user):
@@ -198,81 +459,71 @@ class KPITemplate(models.Model):
             target = float(self.target_value) if self.target_value else 0
             threshold = float(self.threshold_value) if self.threshold_value else 0
             
-            if self.scoring_method == 'linear':
-                if target > 0:
-                    return min((actual / target) * 100, 100)
-                return 0
-            
-            elif self.scoring_method == 'threshold':
-                if actual >= threshold:
-                    return 100
-                elif actual > 0:
-                    return (actual / threshold) * 100
-                return 0
-            
-            elif self.scoring_method == 'exponential':
-                if target > 0:
-                    ratio = actual / target
-                    return min((ratio ** 2) * 100, 100)
-                return 0
-            
-            elif self.scoring_method == 'custom':
+            if self.scoring_method == 'custom':
                 # Use custom formula from scoring_criteria
                 formula = self.scoring_criteria.get('formula', '')
                 if formula:
-                    # This would need a safe formula evaluator
                     return self._evaluate_custom_formula(formula, actual, target, threshold)
                 return 0
             
-            return 0
+            return _score(self.scoring_method, actual, target, threshold)
             
         except (ValueError, TypeError):
             return 0
 
     def _evaluate_custom_formula(self, formula, actual, target, threshold):
-        """Evaluate custom scoring formula (simplified implementation)"""
+        """Evaluate a custom scoring formula over actual, target and threshold"""
         try:
-            # This is a simplified implementation
-            # In production, you'd want a proper formula parser
-            if 'actual' in formula and 'target' in formula:
-                # Replace variables with values
-                eval_formula = formula.replace('actual', str(actual)).replace('target', str(target))
-                return min(eval(eval_formula), 100)
-            return 0
-        except:
+            code = _compile_formula(formula)
+            namespace = {'actual': actual, 'target': target, 'threshold': threshold, **FORMULA_FUNCTIONS}
+            return min(eval(code, {'__builtins__': {}}, namespace), 100)
+        except (SyntaxError, ValueError, TypeError, ArithmeticError):
             return 0
 
     def clone_kpi(self, new_name=None, new_version=None):
         """Clone this KPI for reuse"""
-        new_kpi = KPITemplate.objects.create(
-            name=new_name or f"{self.name} (Copy)",
-            description=self.description,
-            kpi_type=self.kpi_type,
-            visibility=self.visibility,
-            unit_of_measure=self.unit_of_measure,
-            min_value=self.min_value,
-            max_value=self.max_value,
-            default_weight=self.default_weight,
-            target_value=self.target_value,
-            threshold_value=self.threshold_value,
-            is_auto_calculated=self.is_auto_calculated,
-            data_source=self.data_source,
-            calculation_formula=self.calculation_formula,
-            calculation_frequency=self.calculation_frequency,
-            scoring_method=self.scoring_method,
-            scoring_criteria=self.scoring_criteria,
-            is_template=True,
-            template_category=self.template_category,
-            version=new_version or 1
-        )
-        
-        # Copy targeting
-        new_kpi.target_roles.set(self.target_roles.all())
-        new_kpi.target_staff_levels = self.target_staff_levels
-        new_kpi.target_departments.set(self.target_departments.all())
-        new_kpi.target_positions.set(self.target_positions.all())
-        
-        return new_kpi
+        return KPITemplate.bulk_clone([self], [new_name] if new_name else None, new_version)[0]
+
+    @classmethod
+    def bulk_clone(cls, kpis, new_names=None, new_version=None):
+        """
+        Clone KPIs with their targeting using one insert per table. new_names,
+        when given, lines up with kpis; clones are otherwise named "<name> (Copy)".
+        """
+        kpis = list(kpis)
+        new_names = new_names or [None] * len(kpis)
+        clones = cls.objects.bulk_create([
+            cls(
+                name=new_name or f"{kpi.name} (Copy)",
+                description=kpi.description,
+                kpi_type=kpi.kpi_type,
+                visibility=kpi.visibility,
+                has_target_roles=kpi.has_target_roles,
+                target_staff_levels=kpi.target_staff_levels,
+                target_staff_levels_mask=staff_level_mask(kpi.target_staff_levels),
+                unit_of_measure=kpi.unit_of_measure,
+                min_value=kpi.min_value,
+                max_value=kpi.max_value,
+                default_weight=kpi.default_weight,
+                target_value=kpi.target_value,
+                threshold_value=kpi.threshold_value,
+                is_auto_calculated=kpi.is_auto_calculated,
+                data_source=kpi.data_source,
+                calculation_formula=kpi.calculation_formula,
+                calculation_frequency=kpi.calculation_frequency,
+                scoring_method=kpi.scoring_method,
+                scoring_criteria=kpi.scoring_criteria,
+                is_template=True,
+                template_category=kpi.template_category,
+                version=new_version or 1
+            )
+            for kpi, new_name in zip(kpis, new_names)
+        ])
+
+        # Copy targeting (bulk inserts skip m2m_changed; has_target_roles was copied above)
+        _copy_targeting(cls, kpis, clones, ('target_roles', 'target_departments', 'target_positions'))
+
+        return clones
 
 
 class AppraisalFormTemplate(models.Model):
@@ -428,6 +679,17 @@ class PeerFeedback(models.Model):
         return f"Feedback from {self.feedback_provider.username} to {self.feedback_recipient.username}"
 
 
+class EvaluationQuestionQuerySet(TargetingQuerySet):
+    targeting_relations = ('target_roles', 'target_departments')
+
+    def with_targeting(self):
+        """Join the creator and parent question and prefetch the targeting relations"""
+        return self.select_related('created_by', 'depends_on_question').prefetch_related(
+            models.Prefetch('target_roles', queryset=Role.objects.only('id', 'codename', 'role_level')),
+            'target_departments',
+        )
+
+
 class EvaluationQuestion(models.Model):
     """Dynamic evaluation questions with role-based targeting"""
     STAFF_LEVEL_CHOICES = [
@@ -487,6 +749,7 @@ class EvaluationQuestion(models.Model):
     # Role-based targeting
     target_roles = models.ManyToManyField('core.Role', blank=True, related_name='evaluation_questions')
     target_staff_levels = models.JSONField(default=list, blank=True)  # List of staff levels
+    target_staff_levels_mask = models.PositiveSmallIntegerField(default=0)  # Denormalized from target_staff_levels
     target_departments = models.ManyToManyField('core.Department', blank=True, related_name='evaluation_questions')
     
     # Question configuration
@@ -527,6 +790,8 @@ class EvaluationQuestion(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = EvaluationQuestionQuerySet.as_manager()
+
     class Meta:
         ordering = ['section', 'order']
         unique_together = ['section', 'order', 'version']
@@ -534,39 +799,51 @@ class EvaluationQuestion(models.Model):
     def __str__(self):
         return f"{self.get_section_display()} - {self.question_text[:50]}"
 
+    def save(self, *args, **kwargs):
+        _save_staff_level_mask(self, kwargs)
+        super().save(*args, **kwargs)
+
     @property
     def is_conditional(self):
         """Check if this question has conditional logic"""
-        return bool(self.depends_on_question and self.condition_type)
+        return bool(self.depends_on_question_id and self.condition_type)
 
     def is_visible_for_user(self, user):
-        """Check if this question should be visible for a specific user"""
-        user_roles = user.core_user_roles.filter(is_active=True)
-        user_department = getattr(user.profile, 'department', None)
-        
-        # Check role targeting
-        if self.target_roles.exists():
-            if not any(ur.role in self.target_roles.all() for ur in user_roles):
-                return False
-        
-        # Check staff level targeting
+        """Check if this question should be visible for a specific user (cached briefly per user)"""
+        return _cached_visibility(self, user, self._compute_visibility)
+
+    def _compute_visibility(self, user):
+        # Check staff level targeting (the list is already on the row)
         if self.target_staff_levels:
             user_staff_level = getattr(user.profile.position, 'staff_level', 'junior')
-            if user_staff_level not in self.target_staff_levels:
+            if not _targets_staff_level(self, user_staff_level):
                 return False
-        
-        # Check department targeting
-        if self.target_departments.exists():
-            if not user_department or user_department not in self.target_departments.all():
-                return False
-        
-        return True
+
+        if getattr(self, 'target_roles_count', None) == 0 and getattr(self, 'target_departments_count', None) == 0:
+            return True
+
+        # Role and department targeting in one query: each relation is either
+        # empty (the LEFT JOIN yields NULL) or contains one of the user's rows
+        department_id = user.profile.department_id
+        role_ok = models.Q(target_roles__isnull=True) | models.Q(
+            target_roles__in=user.core_user_roles.filter(is_active=True).values('role_id')
+        )
+        department_ok = models.Q(target_departments__isnull=True)
+        if department_id:
+            department_ok |= models.Q(target_departments=department_id)
+        return EvaluationQuestion.objects.filter(role_ok, department_ok, pk=self.pk).exists()
 
     def get_options_list(self):
-        """Get options as a list for select/rating questions"""
+        """Get options as a list for select/rating questions (parsed once per options value)"""
+        cached = self.__dict__.get('_options_cache')
+        if cached is not None and cached[0] == self.options:
+            return cached[1]
         if not self.options:
-            return []
-        return [option.strip() for option in self.options.split('\n') if option.strip()]
+            options = []
+        else:
+            options = [option.strip() for option in self.options.split('\n') if option.strip()]
+        self.__dict__['_options_cache'] = (self.options, options)
+        return options
 
     def get_scoring_criteria(self):
         """Get scoring criteria for the question"""
@@ -608,32 +885,41 @@ class EvaluationQuestion(models.Model):
 
     def clone_question(self, new_section=None, new_order=None):
         """Clone this question for reuse"""
-        new_question = EvaluationQuestion.objects.create(
-            question_text=self.question_text,
-            section=new_section or self.section,
-            question_type=self.question_type,
-            options=self.options,
-            min_value=self.min_value,
-            max_value=self.max_value,
-            default_value=self.default_value,
-            placeholder_text=self.placeholder_text,
-            help_text=self.help_text,
-            required=self.required,
-            order=new_order or self.order,
-            weight=self.weight,
-            is_required=self.is_required,
-            scoring_criteria=self.scoring_criteria,
-            is_template=True,
-            template_category=self.template_category,
-            version=1
-        )
-        
+        return EvaluationQuestion.bulk_clone([self], new_section, new_order)[0]
+
+    @classmethod
+    def bulk_clone(cls, questions, new_section=None, new_order=None):
+        """Clone questions with their targeting using one insert per table"""
+        questions = list(questions)
+        clones = cls.objects.bulk_create([
+            cls(
+                question_text=question.question_text,
+                section=new_section or question.section,
+                question_type=question.question_type,
+                target_staff_levels=question.target_staff_levels,
+                target_staff_levels_mask=staff_level_mask(question.target_staff_levels),
+                options=question.options,
+                min_value=question.min_value,
+                max_value=question.max_value,
+                default_value=question.default_value,
+                placeholder_text=question.placeholder_text,
+                help_text=question.help_text,
+                required=question.required,
+                order=new_order or question.order,
+                weight=question.weight,
+                is_required=question.is_required,
+                scoring_criteria=question.scoring_criteria,
+                is_template=True,
+                template_category=question.template_category,
+                version=1
+            )
+            for question in questions
+        ])
+
         # Copy targeting
-        new_question.target_roles.set(self.target_roles.all())
-        new_question.target_staff_levels = self.target_staff_levels
-        new_question.target_departments.set(self.target_departments.all())
-        
-        return new_question
+        _copy_targeting(cls, questions, clones, ('target_roles', 'target_departments'))
+
+        return clones
 
 
 class PerformanceAspect(models.Model):
@@ -683,7 +969,6 @@ class EvaluationForm(models.Model):
         unique_together = ['user', 'period']
         ordering = ['-created_at']
         indexes = [
-            models.Index(fields=['user', 'period']),
             models.Index(fields=['status']),
             models.Index(fields=['period', 'status']),
         ]
@@ -696,6 +981,7 @@ class KPIResponse(models.Model):
     """Individual KPI responses for evaluation forms"""
     evaluation_form = models.ForeignKey(EvaluationForm, on_delete=models.CASCADE, related_name='kpi_responses')
     kpi = models.ForeignKey(KPITemplate, on_delete=models.CASCADE)
+    kpi_name = models.CharField(max_length=200, db_index=True, default="")  # Denormalized from kpi.name for ordering
     self_assessment_value = models.DecimalField(max_digits=10, decimal_places=2, null=True, blank=True)
     self_assessment_comment = models.TextField(blank=True)
     supervisor_assessment_value = models.DecimalField(max_digits=10, decimal_places=2, null=True, blank=True)
@@ -708,11 +994,19 @@ class KPIResponse(models.Model):
 
     class Meta:
         unique_together = ['evaluation_form', 'kpi']
-        ordering = ['kpi__name']
+        ordering = ['kpi_name']
 
     def __str__(self):
         return f"{self.evaluation_form.user.username} - {self.kpi.name}"
 
+    def save(self, *args, **kwargs):
+        update_fields = kwargs.get('update_fields')
+        if update_fields is None or 'kpi' in update_fields:
+            self.kpi_name = self.kpi.name
+            if update_fields is not None:
+                kwargs['update_fields'] = {*update_fields, 'kpi_name'}
+        super().save(*args, **kwargs)
+
 
 class PerformanceRating(models.Model):
     """Individual performance aspect ratings"""
@@ -46,7 +46,13 @@ class KPIService:
     
     @staticmethod
     def get_visible_kpis_for_user(user, department=None):
-        """Get KPIs visible to a specific user based on their role and department"""
+        """
+        Get KPIs visible to a specific user based on their role and department.
+        HR and admin users see every active KPI. Everyone else gets the KPIs
+        that KPITemplate.is_visible_for_user admits: 'all' and matching
+        'department' KPIs as before, plus 'management', 'hr', 'role', 'level'
+        and 'custom' KPIs whose targeting matches the user.
+        """
         user_roles = UserRole.objects.filter(user=user, is_active=True)
         is_hr = user_roles.filter(role='hr').exists()
         is_admin = user_roles.filter(role='admin').exists()
@@ -59,13 +65,9 @@ class KPIService:
             # HR and admin can see all KPIs
             pass
         else:
-            # Regular users can only see KPIs with 'all' visibility
-            # or department-specific KPIs if they're in that department
-            user_department = department or user.profile.department
-            kpis = kpis.filter(
-                Q(visibility='all') |
-                Q(visibility='department', target_departments=user_department)
-            )
+            # Regular users see the KPIs whose visibility settings admit them,
+            # resolved in one query (department overrides the profile's)
+            kpis = kpis.visible_to(user, department_id=department.pk if department else None)
         
         return kpis
     
@@ -244,7 +246,7 @@ class GoalService:
                 goal.completion_date = timezone.now().date()
             elif goal.target_date < timezone.now().date() and goal.status == 'active':
                 goal.status = 'overdue'
-            goal.save()
+            goal.save(update_fields=['progress_percentage', 'status', 'completion_date', 'updated_at'])
             
             # Create progress record
             GoalProgress.objects.create(
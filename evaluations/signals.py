@@ -0,0 +1,55 @@
+from django.db.models import Exists, OuterRef
+from django.db.models.signals import m2m_changed, post_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from .models import KPITemplate, EvaluationQuestion, KPIResponse
+
+
+@receiver(post_save, sender=KPITemplate)
+def sync_kpi_response_names(sender, instance, created, update_fields, **kwargs):
+    """Keep the denormalized KPIResponse.kpi_name in step with the KPI"""
+    if created or (update_fields is not None and 'name' not in update_fields):
+        return
+    KPIResponse.objects.filter(kpi=instance).exclude(kpi_name=instance.name).update(kpi_name=instance.name)
+
+
+@receiver(m2m_changed, sender=KPITemplate.target_roles.through)
+@receiver(m2m_changed, sender=KPITemplate.target_departments.through)
+@receiver(m2m_changed, sender=KPITemplate.target_positions.through)
+@receiver(m2m_changed, sender=EvaluationQuestion.target_roles.through)
+@receiver(m2m_changed, sender=EvaluationQuestion.target_departments.through)
+def sync_targeting_owner(sender, instance, action, reverse, model, pk_set, **kwargs):
+    """
+    Bump updated_at when targeting changes so cached visibility checks are
+    keyed out (plain saves already move updated_at through auto_now), and
+    keep KPITemplate.has_target_roles in step with target_roles.
+    """
+    if reverse:
+        # Changed from the Role/Department/Position side: the owners are `model`.
+        # A clear has no pk_set, so collect the owners before the rows go.
+        if action == 'pre_clear':
+            instance._targeting_owner_ids = set(
+                sender.objects.filter(**{instance._meta.model_name: instance})
+                .values_list(f"{model._meta.model_name}_id", flat=True)
+            )
+            return
+        if action == 'post_clear':
+            pk_set = instance.__dict__.pop('_targeting_owner_ids', None)
+        elif action not in ('post_add', 'post_remove'):
+            return
+        owner_model, owner_ids = model, pk_set
+    else:
+        if action not in ('post_add', 'post_remove', 'post_clear'):
+            return
+        owner_model, owner_ids = type(instance), {instance.pk}
+    if not owner_ids:
+        return
+
+    changes = {'updated_at': timezone.now()}
+    if sender is KPITemplate.target_roles.through:
+        changes['has_target_roles'] = Exists(sender.objects.filter(kpitemplate_id=OuterRef('pk')))
+    owner_model.objects.filter(pk__in=owner_ids).update(**changes)
+
+    if not reverse:
+        instance.refresh_from_db(fields=list(changes))
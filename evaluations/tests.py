@@ -1,3 +1,158 @@
-from django.test import TestCase
+from itertools import product
 
-# Create your tests here.
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+
+from core.models import Department, Position, Role, UserRole
+from users import models as users_models
+from users.models import UserProfile
+
+from .models import KPITemplate, _compile_formula
+from .services import KPIService
+
+
+LOCMEM_CACHES = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}
+
+
+class KPITestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.finance = Department.objects.create(name='Finance', code='FIN')
+        self.sales = Department.objects.create(name='Sales', code='SAL')
+        self.analyst = Position.objects.create(
+            title='Analyst', department=self.finance, staff_level='junior', contiss_level='7',
+        )
+        self.senior_rep = Position.objects.create(
+            title='Senior Rep', department=self.sales, staff_level='senior', contiss_level='12',
+        )
+        self.member = Role.objects.create(name='Member', codename='member', role_level='mid')
+        self.manager = Role.objects.create(name='Manager', codename='manager', role_level='manager')
+        self.hr = Role.objects.create(name='HR', codename='hr', role_level='senior')
+
+    def make_user(self, username, roles=(), department=None, position=None):
+        user = User.objects.create_user(username)
+        UserProfile.objects.create(user=user, employee_id=username, department=department, position=position)
+        for role in roles:
+            UserRole.objects.create(user=user, role=role)
+        return user
+
+    def make_kpi(self, name, visibility, roles=(), departments=(), positions=(), staff_levels=(), **fields):
+        kpi = KPITemplate.objects.create(
+            name=name, description=name, kpi_type='quantitative', visibility=visibility,
+            target_staff_levels=list(staff_levels), **fields,
+        )
+        kpi.target_roles.set(roles)
+        kpi.target_departments.set(departments)
+        kpi.target_positions.set(positions)
+        return kpi
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class KPIVisibilityTests(KPITestCase):
+    def test_visible_to_matches_is_visible_for_user(self):
+        kpis = [
+            self.make_kpi(f"kpi-{index}", visibility, roles, departments, positions, staff_levels)
+            for index, (visibility, roles, departments, positions, staff_levels) in enumerate(product(
+                [value for value, _ in KPITemplate.VISIBILITY_CHOICES],
+                [(), (self.member,)],
+                [(), (self.finance,)],
+                [(), (self.analyst,)],
+                [(), ('senior',)],
+            ))
+        ]
+        profiles = [(None, None), (self.finance, None), (self.finance, self.analyst), (self.sales, self.senior_rep)]
+        role_sets = [(), (self.member,), (self.manager,), (self.hr,)]
+        for index, (roles, (department, position)) in enumerate(product(role_sets, profiles)):
+            user = self.make_user(f"user-{index}", roles, department, position)
+            visible = set(KPITemplate.objects.visible_to(user).values_list('pk', flat=True))
+            with self.subTest(roles=roles, department=department, position=position):
+                self.assertEqual(visible, {kpi.pk for kpi in kpis if kpi.is_visible_for_user(user)})
+
+    def test_targeting_change_invalidates_cached_visibility(self):
+        user = self.make_user('dana', department=self.sales)
+        kpi = self.make_kpi('Revenue', 'department', departments=[self.finance])
+        self.assertFalse(kpi.is_visible_for_user(user))
+
+        kpi.target_departments.add(self.sales)
+        self.assertTrue(kpi.is_visible_for_user(user))
+
+        self.sales.kpi_templates.remove(kpi)
+        kpi.refresh_from_db()
+        self.assertFalse(kpi.is_visible_for_user(user))
+
+
+class CustomFormulaTests(TestCase):
+    def make_kpi(self, formula):
+        return KPITemplate(
+            name='Custom', description='Custom', kpi_type='quantitative', target_value=50, threshold_value=20,
+            scoring_method='custom', scoring_criteria={'formula': formula},
+        )
+
+    def test_arithmetic_formulas(self):
+        self.assertEqual(self.make_kpi('actual / target * 100').calculate_score(25), 50)
+        self.assertEqual(self.make_kpi('max(actual - threshold, 0) ** 2').calculate_score(25), 25)
+        self.assertEqual(self.make_kpi('actual * 10').calculate_score(25), 100)
+
+    def test_disallowed_formulas(self):
+        for formula in [
+            "__import__('os').system('true')",
+            'actual.__class__',
+            'open',
+            'target + other',
+            "'a' * 10",
+            'True + actual',
+            'actual ** target',
+            '2 ** 100',
+            'max(actual, key=abs)',
+            '(lambda: 1)()',
+            '[actual][0]',
+            'actual if target else threshold',
+            'actual +',
+        ]:
+            with self.subTest(formula=formula):
+                with self.assertRaises((ValueError, SyntaxError)):
+                    _compile_formula(formula)
+                self.assertEqual(self.make_kpi(formula).calculate_score(25), 0)
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class VisibleKPIServiceTests(KPITestCase):
+    def setUp(self):
+        super().setUp()
+        self.kpis = {
+            'all': self.make_kpi('All staff', 'all'),
+            'department': self.make_kpi('Finance only', 'department', departments=[self.finance]),
+            'other department': self.make_kpi('Sales only', 'department', departments=[self.sales]),
+            'management': self.make_kpi('Managers', 'management'),
+            'hr': self.make_kpi('HR', 'hr'),
+            'role': self.make_kpi('Members', 'role', roles=[self.member]),
+            'other role': self.make_kpi('Managers by role', 'role', roles=[self.manager]),
+            'level': self.make_kpi('Juniors', 'level', staff_levels=['junior']),
+            'other level': self.make_kpi('Seniors', 'level', staff_levels=['senior']),
+            'custom': self.make_kpi('Finance juniors', 'custom', departments=[self.finance], staff_levels=['junior']),
+            'other custom': self.make_kpi('Analyst managers', 'custom', roles=[self.manager], positions=[self.analyst]),
+            'inactive': self.make_kpi('Retired', 'all', is_active=False),
+        }
+
+    def visible(self, user, department=None):
+        kpis = KPIService.get_visible_kpis_for_user(user, department)
+        return {name for name, kpi in self.kpis.items() if kpi in kpis}
+
+    def test_regular_user_sees_kpis_targeting_them(self):
+        user = self.make_user('erin', roles=[self.member], department=self.finance, position=self.analyst)
+        self.assertEqual(self.visible(user), {'all', 'department', 'role', 'level', 'custom'})
+        self.assertEqual(self.visible(user, department=self.sales), {'all', 'other department', 'role', 'level'})
+
+    def test_role_holders_see_management_and_hr_kpis(self):
+        manager = self.make_user('fred', roles=[self.manager], department=self.sales, position=self.senior_rep)
+        self.assertEqual(self.visible(manager), {'all', 'other department', 'management', 'other role', 'other level'})
+        hr_officer = self.make_user('gina', roles=[self.hr])
+        self.assertEqual(self.visible(hr_officer), {'all', 'hr'})
+
+    def test_hr_and_admin_see_all_active_kpis(self):
+        for role in ('hr', 'admin'):
+            user = self.make_user(f"{role}-user")
+            users_models.UserRole.objects.create(user=user, role=role)
+            with self.subTest(role=role):
+                self.assertEqual(self.visible(user), set(self.kpis) - {'inactive'})
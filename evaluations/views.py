@@ -24,7 +24,7 @@ from .services import (
     ConditionalApprovalService, AnalyticsService, NotificationService
 )
 from core.models import Department, Role, UserRole
-from core.permissions import has_permission, get_user_permissions
+from core.permissions import request_has_permission, get_user_permissions
 from users.models import UserProfile
 
 
@@ -37,7 +37,7 @@ from users.models import UserProfile
 def evaluation_question_list(request):
     """List and create evaluation questions"""
     if request.method == 'GET':
-        if not has_permission(request.user, 'read', 'form_template'):
+        if not request_has_permission(request, 'read', 'form_template'):
             return Response({'error': 'Permission denied'}, status=status.HTTP_403_FORBIDDEN)
         
         questions = EvaluationQuestion.objects.filter(is_active=True)
@@ -77,7 +77,7 @@ def evaluation_question_list(request):
         return Response(data)
     
     elif request.method == 'POST':
-        if not has_permission(request.user, 'create', 'form_template'):
+        if not request_has_permission(request, 'create', 'form_template'):
             return Response({'error': 'Permission denied'}, status=status.HTTP_403_FORBIDDEN)
         
         try:
@@ -111,7 +111,7 @@ def evaluation_question_detail(request, question_id):
     question = get_object_or_404(EvaluationQuestion, id=question_id)
     
     if request.method == 'GET':
-        if not has_permission(request.user, 'read', 'form_template'):
+        if not request_has_permission(request, 'read', 'form_template'):
             return Response({'error': 'Permission denied'}, status=status.HTTP_403_FORBIDDEN)
         
         data = {
@@ -133,7 +133,7 @@ def evaluation_question_detail(request, question_id):
         return Response(data)
     
     elif request.method == 'PUT':
-        if not has_permission(request.user, 'update', 'form_template'):
+        if not request_has_permission(request, 'update', 'form_template'):
             return Response({'error': 'Permission denied'}, status=status.HTTP_403_FORBIDDEN)
         
         try:
@@ -162,11 +162,11 @@ def evaluation_question_detail(request, question_id):
             return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
     
     elif request.method == 'DELETE':
-        if not has_permission(request.user, 'delete', 'form_template'):
+        if not request_has_permission(request, 'delete', 'form_template'):
             return Response({'error': 'Permission denied'}, status=status.HTTP_403_FORBIDDEN)
         
         question.is_active = False
-        question.save()
+        question.save(update_fields=['is_active', 'updated_at'])
         
         return Response({'message': 'Question deleted successfully'})
 
@@ -187,7 +187,7 @@ def evaluation_question_choices(request):
 @permission_classes([IsAuthenticated])
 def get_questions_for_user(request, user_id):
     """Get evaluation questions appropriate for a specific user"""
-    if not has_permission(request.user, 'read', 'form_template'):
+    if not request_has_permission(request, 'read', 'form_template'):
         return Response({'error': 'Permission denied'}, status=status.HTTP_403_FORBIDDEN)
     
     try:
@@ -248,7 +248,7 @@ def get_questions_for_user(request, user_id):
 def form_template_list(request):
     """List and create form templates"""
     if request.method == 'GET':
-        if not has_permission(request.user, 'read', 'form_template'):
+        if not request_has_permission(request, 'read', 'form_template'):
             return Response({'error': 'Permission denied'}, status=status.HTTP_403_FORBIDDEN)
         
         templates = AppraisalFormTemplate.objects.filter(is_active=True)
@@ -283,7 +283,7 @@ def form_template_list(request):
         return Response(data)
     
     elif request.method == 'POST':
-        if not has_permission(request.user, 'create', 'form_template'):
+        if not request_has_permission(request, 'create', 'form_template'):
             return Response({'error': 'Permission denied'}, status=status.HTTP_403_FORBIDDEN)
         
         try:
@@ -307,7 +307,7 @@ def form_template_detail(request, template_id):
     template = get_object_or_404(AppraisalFormTemplate, id=template_id)
     
     if request.method == 'GET':
-        if not has_permission(request.user, 'read', 'form_template'):
+        if not request_has_permission(request, 'read', 'form_template'):
             return Response({'error': 'Permission denied'}, status=status.HTTP_403_FORBIDDEN)
         
         kpis = template.formkpi_set.all().select_related('kpi')
@@ -343,7 +343,7 @@ def form_template_detail(request, template_id):
         return Response(data)
     
     elif request.method == 'PUT':
-        if not has_permission(request.user, 'update', 'form_template'):
+        if not request_has_permission(request, 'update', 'form_template'):
             return Response({'error': 'Permission denied'}, status=status.HTTP_403_FORBIDDEN)
         
         try:
@@ -369,7 +369,7 @@ def form_template_detail(request, template_id):
                 # Update target staff levels
                 if 'target_staff_levels' in data:
                     template.target_staff_levels = data['target_staff_levels']
-                    template.save()
+                    template.save(update_fields=['target_staff_levels', 'updated_at'])
                 
                 # Update KPIs
                 if 'kpis' in data:
@@ -392,11 +392,11 @@ def form_template_detail(request, template_id):
             return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
     
     elif request.method == 'DELETE':
-        if not has_permission(request.user, 'delete', 'form_template'):
+        if not request_has_permission(request, 'delete', 'form_template'):
             return Response({'error': 'Permission denied'}, status=status.HTTP_403_FORBIDDEN)
         
         template.is_active = False
-        template.save()
+        template.save(update_fields=['is_active', 'updated_at'])
         
         return Response({'message': 'Form template deleted successfully'})
 
@@ -405,7 +405,7 @@ def form_template_detail(request, template_id):
 @permission_classes([IsAuthenticated])
 def clone_form_template(request, template_id):
     """Clone an existing form template"""
-    if not has_permission(request.user, 'create', 'form_template'):
+    if not request_has_permission(request, 'create', 'form_template'):
         return Response({'error': 'Permission denied'}, status=status.HTTP_403_FORBIDDEN)
     
     try:
@@ -429,7 +429,7 @@ def clone_form_template(request, template_id):
 @permission_classes([IsAuthenticated])
 def get_appropriate_template(request, user_id, form_type=None):
     """Get the most appropriate form template for a user"""
-    if not has_permission(request.user, 'read', 'form_template'):
+    if not request_has_permission(request, 'read', 'form_template'):
         return Response({'error': 'Permission denied'}, status=status.HTTP_403_FORBIDDEN)
     
     try:
@@ -462,10 +462,10 @@ def get_appropriate_template(request, user_id, form_type=None):
 def kpi_template_list(request):
     """List and create KPI templates"""
     if request.method == 'GET':
-        if not has_permission(request.user, 'read', 'kpi'):
+        if not request_has_permission(request, 'read', 'kpi'):
             return Response({'error': 'Permission denied'}, status=status.HTTP_403_FORBIDDEN)
         
-        kpis = KPIService.get_visible_kpis_for_user(request.user)
+        kpis = KPIService.get_visible_kpis_for_user(request.user).with_targeting()
         
         # Filter by KPI type
         kpi_type = request.GET.get('kpi_type')
@@ -502,7 +502,7 @@ def kpi_template_list(request):
         return Response(data)
     
     elif request.method == 'POST':
-        if not has_permission(request.user, 'create', 'kpi'):
+        if not request_has_permission(request, 'create', 'kpi'):
             return Response({'error': 'Permission denied'}, status=status.HTTP_403_FORBIDDEN)
         
         try:
@@ -539,7 +539,7 @@ def kpi_choices(request):
 def evaluation_period_list(request):
     """List and create evaluation periods"""
     if request.method == 'GET':
-        if not has_permission(request.user, 'read', 'evaluation'):
+        if not request_has_permission(request, 'read', 'evaluation'):
             return Response({'error': 'Permission denied'}, status=status.HTTP_403_FORBIDDEN)
         
         periods = EvaluationPeriod.objects.filter(is_active=True).order_by('-start_date')
@@ -562,7 +562,7 @@ def evaluation_period_list(request):
         return Response(data)
     
     elif request.method == 'POST':
-        if not has_permission(request.user, 'create', 'evaluation'):
+        if not request_has_permission(request, 'create', 'evaluation'):
             return Response({'error': 'Permission denied'}, status=status.HTTP_403_FORBIDDEN)
         
         try:
@@ -596,7 +596,7 @@ def evaluation_period_list(request):
 def conditional_approval_rule_list(request):
     """List and create conditional approval rules"""
     if request.method == 'GET':
-        if not has_permission(request.user, 'read', 'approval'):
+        if not request_has_permission(request, 'read', 'approval'):
             return Response({'error': 'Permission denied'}, status=status.HTTP_403_FORBIDDEN)
         
         rules = ConditionalApprovalRule.objects.filter(is_active=True)
@@ -619,7 +619,7 @@ def conditional_approval_rule_list(request):
         return Response(data)
     
     elif request.method == 'POST':
-        if not has_permission(request.user, 'create', 'approval'):
+        if not request_has_permission(request, 'create', 'approval'):
             return Response({'error': 'Permission denied'}, status=status.HTTP_403_FORBIDDEN)
         
         try:
@@ -663,7 +663,7 @@ def conditional_approval_choices(request):
 @permission_classes([IsAuthenticated])
 def analytics_period(request, period_id):
     """Get analytics for a specific period"""
-    if not has_permission(request.user, 'view_analytics', 'analytics'):
+    if not request_has_permission(request, 'view_analytics', 'analytics'):
         return Response({'error': 'Permission denied'}, status=status.HTTP_403_FORBIDDEN)
     
     try:
@@ -707,7 +707,7 @@ def analytics_period(request, period_id):
 @permission_classes([IsAuthenticated])
 def analytics_department_comparison(request, period_id):
     """Compare performance across departments"""
-    if not has_permission(request.user, 'view_analytics', 'analytics'):
+    if not request_has_permission(request, 'view_analytics', 'analytics'):
         return Response({'error': 'Permission denied'}, status=status.HTTP_403_FORBIDDEN)
     
     try:
@@ -724,7 +724,7 @@ def analytics_department_comparison(request, period_id):
 @permission_classes([IsAuthenticated])
 def analytics_kpi_trends(request, period_id):
     """Get KPI performance trends"""
-    if not has_permission(request.user, 'view_analytics', 'analytics'):
+    if not request_has_permission(request, 'view_analytics', 'analytics'):
         return Response({'error': 'Permission denied'}, status=status.HTTP_403_FORBIDDEN)
     
     try:
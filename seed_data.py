@@ -282,17 +282,22 @@ def create_roles():
         }
     ]
     
-    created_roles = {}
-    for role_data in roles_data:
-        role, created = Role.objects.get_or_create(
-            codename=role_data['codename'],
-            defaults=role_data
-        )
-        created_roles[role_data['codename']] = role
-        if created:
-            print(f"✅ Created role: {role.name}")
-        else:
+    codenames = [role_data['codename'] for role_data in roles_data]
+    existing = set(Role.objects.filter(codename__in=codenames).values_list('codename', flat=True))
+    
+    # One INSERT for all missing roles, then one SELECT to load them back
+    Role.objects.bulk_create(
+        [Role(**role_data) for role_data in roles_data if role_data['codename'] not in existing],
+        ignore_conflicts=True
+    )
+    created_roles = Role.objects.in_bulk(codenames, field_name='codename')
+    
+    for codename in codenames:
+        role = created_roles[codename]
+        if codename in existing:
             print(f"⚠️  Role already exists: {role.name}")
+        else:
+            print(f"✅ Created role: {role.name}")
     
     # Set up role hierarchy relationships
     setup_role_hierarchy(created_roles)
@@ -302,27 +307,24 @@ def create_roles():
 
 def setup_role_hierarchy(roles):
     """Set up role hierarchy and management relationships"""
+    # Each relation is added with a single .add(*roles) call rather than one call per role
+    
     # System Admin can manage all roles
     system_admin = roles.get('system_admin')
     if system_admin:
-        for role in roles.values():
-            if role != system_admin:
-                system_admin.can_manage_roles.add(role)
-                system_admin.can_create_kpis_for.add(role)
-                system_admin.can_evaluate_roles.add(role)
+        others = [role for role in roles.values() if role != system_admin]
+        system_admin.can_manage_roles.add(*others)
+        system_admin.can_create_kpis_for.add(*others)
+        system_admin.can_evaluate_roles.add(*others)
     
     # HR Director can manage HR roles and evaluate all
     hr_director = roles.get('hr_director')
     if hr_director:
-        hr_roles = [roles.get('hr_manager'), roles.get('hr_officer')]
-        for role in hr_roles:
-            if role:
-                hr_director.can_manage_roles.add(role)
-                hr_director.can_create_kpis_for.add(role)
+        hr_roles = [role for role in (roles.get('hr_manager'), roles.get('hr_officer')) if role]
+        hr_director.can_manage_roles.add(*hr_roles)
+        hr_director.can_create_kpis_for.add(*hr_roles)
         # HR Director can evaluate all roles
-        for role in roles.values():
-            if role != hr_director:
-                hr_director.can_evaluate_roles.add(role)
+        hr_director.can_evaluate_roles.add(*[role for role in roles.values() if role != hr_director])
     
     # HR Manager can manage HR Officer
     hr_manager = roles.get('hr_manager')
@@ -335,32 +337,26 @@ def setup_role_hierarchy(roles):
     # Department Director can manage department roles
     dept_director = roles.get('dept_director')
     if dept_director:
-        dept_roles = [roles.get('dept_manager'), roles.get('team_lead'), roles.get('senior_staff'), roles.get('junior_staff'), roles.get('entry_staff')]
-        for role in dept_roles:
-            if role:
-                dept_director.can_manage_roles.add(role)
-                dept_director.can_create_kpis_for.add(role)
-                dept_director.can_evaluate_roles.add(role)
+        dept_roles = [role for role in (roles.get('dept_manager'), roles.get('team_lead'), roles.get('senior_staff'), roles.get('junior_staff'), roles.get('entry_staff')) if role]
+        dept_director.can_manage_roles.add(*dept_roles)
+        dept_director.can_create_kpis_for.add(*dept_roles)
+        dept_director.can_evaluate_roles.add(*dept_roles)
     
     # Department Manager can manage team roles
     dept_manager = roles.get('dept_manager')
     if dept_manager:
-        team_roles = [roles.get('team_lead'), roles.get('senior_staff'), roles.get('junior_staff'), roles.get('entry_staff')]
-        for role in team_roles:
-            if role:
-                dept_manager.can_manage_roles.add(role)
-                dept_manager.can_create_kpis_for.add(role)
-                dept_manager.can_evaluate_roles.add(role)
+        team_roles = [role for role in (roles.get('team_lead'), roles.get('senior_staff'), roles.get('junior_staff'), roles.get('entry_staff')) if role]
+        dept_manager.can_manage_roles.add(*team_roles)
+        dept_manager.can_create_kpis_for.add(*team_roles)
+        dept_manager.can_evaluate_roles.add(*team_roles)
     
     # Team Lead can manage junior staff
     team_lead = roles.get('team_lead')
     if team_lead:
-        junior_roles = [roles.get('senior_staff'), roles.get('junior_staff'), roles.get('entry_staff')]
-        for role in junior_roles:
-            if role:
-                team_lead.can_manage_roles.add(role)
-                team_lead.can_create_kpis_for.add(role)
-                team_lead.can_evaluate_roles.add(role)
+        junior_roles = [role for role in (roles.get('senior_staff'), roles.get('junior_staff'), roles.get('entry_staff')) if role]
+        team_lead.can_manage_roles.add(*junior_roles)
+        team_lead.can_create_kpis_for.add(*junior_roles)
+        team_lead.can_evaluate_roles.add(*junior_roles)
     
     print("✅ Role hierarchy relationships configured")
 
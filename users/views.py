@@ -197,7 +197,7 @@ def reset_password(request, staff_id):
         
         # Reset password
         user.password = make_password('National2025')
-        user.save()
+        user.save(update_fields=['password'])
         
         # Send notification
         action_notification_service.password_reset_notification(user, 'National2025')
@@ -227,7 +227,7 @@ def change_password(request, staff_id):
         if serializer.is_valid():
             new_password = serializer.validated_data['new_password']
             user.password = make_password(new_password)
-            user.save()
+            user.save(update_fields=['password'])
             
             # Send notification
             action_notification_service.password_reset_notification(user, new_password)